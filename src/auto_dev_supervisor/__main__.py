@@ -0,0 +1,4 @@
+from auto_dev_supervisor.main import main
+
+if __name__ == "__main__":
+    main()
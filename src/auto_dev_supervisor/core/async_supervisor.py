@@ -0,0 +1,78 @@
+"""
+Enhanced Supervisor that runs independent tasks concurrently
+"""
+
+import asyncio
+import threading
+from typing import List
+from rich.console import Console
+from rich.progress import Progress
+
+from auto_dev_supervisor.domain.model import ProjectSpec, Task, TaskStatus, TaskTestResult
+from auto_dev_supervisor.core.enhanced_supervisor import EnhancedSupervisor
+
+console = Console()
+
+class AsyncEnhancedSupervisor(EnhancedSupervisor):
+    """
+    EnhancedSupervisor with a parallel scheduler: every pending task whose dependencies
+    are completed is ready, and ready tasks run in waves of up to max_parallel at a time.
+    Each task still goes through the full enhanced recovery flow on a worker thread.
+    Sections that share state are serialized: Docker build/up (one compose project and one
+    last_error, so a fix sees its own task's build log) and git commit/push.
+
+    All tasks write into one working tree and a commit stages the whole tree, so a task's
+    commit can include files another in-flight task has written so far; commit messages
+    attribute every staged file to the committing task.
+    """
+
+    def __init__(self, *args, max_parallel: int = 3, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_parallel = max(1, max_parallel)
+        self._git_lock = threading.Lock()
+        self._docker_lock = threading.Lock()
+
+    def _run_enhanced_main_loop(self, tasks: List[Task], spec: ProjectSpec):
+        asyncio.run(self._run_parallel_main_loop(tasks, spec))
+
+    async def _run_parallel_main_loop(self, tasks: List[Task], spec: ProjectSpec):
+        """Dispatch ready tasks concurrently until nothing is left to run"""
+        with Progress() as progress:
+            task_progress = progress.add_task("[cyan]Processing tasks in parallel with enhanced recovery...", total=len(tasks))
+
+            iteration = 0
+            max_iterations = len(tasks) * 3  # Same safety bound as the sequential loop
+
+            while iteration < max_iterations:
+                completed_ids = {t.id for t in tasks if t.status == TaskStatus.COMPLETED}
+                ready = [
+                    t for t in tasks
+                    if t.status == TaskStatus.PENDING and all(dep in completed_ids for dep in t.dependencies)
+                ]
+                if not ready:
+                    if all(t.status == TaskStatus.COMPLETED for t in tasks):
+                        console.print("[bold green]All tasks completed successfully![/bold green]")
+                        self.progress_monitor.milestone_reached("all_tasks_completed", "All tasks finished successfully")
+                    else:
+                        failed_tasks = [t for t in tasks if t.status == TaskStatus.FAILED]
+                        console.print(f"[bold red]Some tasks failed after maximum recovery attempts. Failed: {len(failed_tasks)}[/bold red]")
+                        self._suggest_manual_intervention(failed_tasks)
+                    break
+
+                wave = ready[:self.max_parallel]
+                if len(wave) > 1:
+                    console.print(f"[cyan]Running {len(wave)} independent tasks in parallel: {', '.join(t.id for t in wave)}[/cyan]")
+                await asyncio.gather(*(
+                    asyncio.to_thread(self._process_task_with_enhanced_recovery, task, spec, progress, iteration + i)
+                    for i, task in enumerate(wave)
+                ))
+                progress.update(task_progress, advance=len(wave))
+                iteration += len(wave)
+
+    def _build_and_start_services(self, task: Task):
+        with self._docker_lock:
+            super()._build_and_start_services(task)
+
+    def _commit_and_push(self, task: Task, test_results: List[TaskTestResult]):
+        with self._git_lock:
+            super()._commit_and_push(task, test_results)
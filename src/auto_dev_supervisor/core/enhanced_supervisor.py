@@ -4,7 +4,7 @@ Enhanced Supervisor with Advanced Iterative Error Resolution
 
 import time
 import json
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from rich.console import Console
 from rich.progress import Progress
 
@@ -14,10 +14,12 @@ from auto_dev_supervisor.core.error_handler import EnhancedErrorHandler as Error
 from auto_dev_supervisor.core.progress_monitor import ProgressMonitor
 from auto_dev_supervisor.core.testing_pipeline import AutomatedTestingPipeline
 from auto_dev_supervisor.infra.opendevin import OpenDevinClient
-from auto_dev_supervisor.infra.docker import DockerManager
 from auto_dev_supervisor.infra.git import GitManager
 from auto_dev_supervisor.domain.qa import QAManager
 
+if TYPE_CHECKING:
+    from auto_dev_supervisor.infra.docker import DockerManager
+
 console = Console()
 
 class EnhancedSupervisor:
@@ -34,7 +36,7 @@ class EnhancedSupervisor:
         self, 
         planner: Planner,
         opendevin: OpenDevinClient,
-        docker_manager: DockerManager,
+        docker_manager: Optional["DockerManager"],
         git_manager: GitManager,
         qa_manager: QAManager,
         project_root: str = ".",
@@ -81,7 +83,8 @@ class EnhancedSupervisor:
             console.print(f"Generated {len(tasks)} tasks.")
             
             # 3. Generate Docker Compose
-            self.docker_manager.generate_compose_file(spec)
+            if self.docker_manager is not None:
+                self.docker_manager.generate_compose_file(spec)
             
             # 4. Start Progress Monitoring
             self.progress_monitor.start_monitoring(len(tasks))
@@ -400,6 +403,27 @@ class EnhancedSupervisor:
         except Exception as e:
             return {"success": False, "message": f"Decomposition strategy error: {str(e)}"}
     
+    def _build_and_start_services(self, task: Task):
+        """Build the task's service (with one LLM fix attempt on failure) and bring the stack up"""
+        if not self.docker_manager.build_services(task.service_name):
+            error = self.error_handler.handle_error(
+                Exception(f"Build failed for {task.service_name}"),
+                {"task_id": task.id, "service_name": task.service_name, "phase": "docker_build"}
+            )
+            console.print(f"[red]Build failed for {task.service_name}.[/red]")
+            
+            # Try to fix build issues
+            build_logs = self.docker_manager.get_last_error()
+            fix_result = self.opendevin.fix_issues(task, build_logs or "Build failed")
+            if fix_result.startswith("Error"):
+                raise Exception(f"Build fix failed: {fix_result}")
+            
+            # Retry build after fix
+            if not self.docker_manager.build_services(task.service_name):
+                raise Exception("Build still failed after fix attempt")
+        
+        self.docker_manager.up()
+    
     def _handle_task_success(self, task: Task, spec: ProjectSpec, result: str):
         """Handle successful task completion"""
         console.print(f"[green]Task execution successful[/green]")
@@ -414,31 +438,13 @@ class EnhancedSupervisor:
         if self.skip_docker:
             console.print("[yellow]Docker operations skipped.[/yellow]")
             if not self.skip_git and not task.id.startswith("implement-") and not task.id.startswith("test-"):
-                self.git_manager.commit_changes(task, [TaskTestResult(type=TaskTestType.UNIT, passed=True, details="Skipped Docker")])
-                self.git_manager.push_changes()
+                self._commit_and_push(task, [TaskTestResult(type=TaskTestType.UNIT, passed=True, details="Skipped Docker")])
             self.progress_monitor.task_completed(task)
             task.status = TaskStatus.COMPLETED
             return
         
         try:
-            if not self.docker_manager.build_services(task.service_name):
-                error = self.error_handler.handle_error(
-                    Exception(f"Build failed for {task.service_name}"),
-                    {"task_id": task.id, "service_name": task.service_name, "phase": "docker_build"}
-                )
-                console.print(f"[red]Build failed for {task.service_name}.[/red]")
-                
-                # Try to fix build issues
-                build_logs = self.docker_manager.get_last_error()
-                fix_result = self.opendevin.fix_issues(task, build_logs or "Build failed")
-                if fix_result.startswith("Error"):
-                    raise Exception(f"Build fix failed: {fix_result}")
-                
-                # Retry build after fix
-                if not self.docker_manager.build_services(task.service_name):
-                    raise Exception("Build still failed after fix attempt")
-            
-            self.docker_manager.up()
+            self._build_and_start_services(task)
         except Exception as e:
             error = self.error_handler.handle_error(
                 e, {"task_id": task.id, "service_name": task.service_name, "phase": "docker_operations"}
@@ -451,8 +457,7 @@ class EnhancedSupervisor:
             console.print("[yellow]Scaffold task. Skipping verification for this step.[/yellow]")
             if not self.skip_git:
                 console.print("[green]Scaffold completed. Committing...[/green]")
-                self.git_manager.commit_changes(task, [TaskTestResult(type=TaskTestType.UNIT, passed=True, details="Scaffold")])
-                self.git_manager.push_changes()
+                self._commit_and_push(task, [TaskTestResult(type=TaskTestType.UNIT, passed=True, details="Scaffold")])
             self.progress_monitor.task_completed(task)
             task.status = TaskStatus.COMPLETED
             return
@@ -465,8 +470,7 @@ class EnhancedSupervisor:
             # D. Commit & Push
             if not self.skip_git:
                 console.print("[green]Verification passed. Committing...[/green]")
-                self.git_manager.commit_changes(task, test_results)
-                self.git_manager.push_changes()
+                self._commit_and_push(task, test_results)
             else:
                 console.print("[yellow]Verification passed. Skipping git commit.[/yellow]")
             
@@ -497,13 +501,17 @@ class EnhancedSupervisor:
             if all_passed:
                 console.print("[green]Verification passed after fix![/green]")
                 if not self.skip_git:
-                    self.git_manager.commit_changes(task, test_results)
-                    self.git_manager.push_changes()
+                    self._commit_and_push(task, test_results)
                 self.progress_monitor.task_completed(task)
                 task.status = TaskStatus.COMPLETED
             else:
                 raise Exception("Verification still failed after fix attempt")
     
+    def _commit_and_push(self, task: Task, test_results: List[TaskTestResult]):
+        """Commit the task's changes and push them"""
+        self.git_manager.commit_changes(task, test_results)
+        self.git_manager.push_changes()
+    
     def _record_failure_pattern(self, task: Task, error_history: List[Dict]):
         """Record failure patterns for future learning"""
         pattern_key = f"{task.service_name}:{task.title}"
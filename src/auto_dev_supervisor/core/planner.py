@@ -1,19 +1,38 @@
+import os
 import yaml
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from rich.console import Console
 from auto_dev_supervisor.core.error_handler import EnhancedErrorHandler as ErrorHandler, ErrorCategory, ErrorSeverity
 from auto_dev_supervisor.domain.model import ProjectSpec, Task, TaskStatus, ServiceSpec, AppType
 
+try:
+    # libyaml's C scanner, when PyYAML was built with it, is several times faster
+    from yaml import CSafeLoader as SpecLoader
+except ImportError:
+    from yaml import SafeLoader as SpecLoader
+
 console = Console()
 
 class Planner:
+    # Parsed specs keyed by (absolute path, mtime, size), shared by all planners in the process:
+    # the CLI and the supervisor both parse the same file during one run
+    _spec_cache: Dict[Tuple[str, int, int], ProjectSpec] = {}
+
     def __init__(self):
         self.error_handler = ErrorHandler()
 
     def parse_spec(self, yaml_path: str) -> ProjectSpec:
         try:
+            abs_path = os.path.abspath(yaml_path)
+            st = os.stat(abs_path)
+            cache_key = (abs_path, st.st_mtime_ns, st.st_size)
+            cached = self._spec_cache.get(cache_key)
+            if cached is not None:
+                # Callers get their own copy, so mutating a spec can't leak into the cache
+                return cached.model_copy(deep=True)
+
             with open(yaml_path, "r") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=SpecLoader)
             # Flexible schema adapter
             if "name" not in data and "project_name" in data:
                 data["name"] = data["project_name"]
@@ -69,7 +88,12 @@ class Planner:
                     _svc("worker").dependencies.append("app")
                 data["services"] = services
 
-            return ProjectSpec(**data)
+            spec = ProjectSpec(**data)
+            # Drop entries for older versions of the same file
+            for stale in [k for k in self._spec_cache if k[0] == abs_path]:
+                del self._spec_cache[stale]
+            self._spec_cache[cache_key] = spec
+            return spec.model_copy(deep=True)
         except FileNotFoundError as e:
             error = self.error_handler.handle_error(
                 e, {"yaml_path": yaml_path, "phase": "parse_spec"}
@@ -1,18 +1,21 @@
 import time
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
 from rich.console import Console
 from rich.progress import Progress
 
-from auto_dev_supervisor.domain.model import ProjectSpec, Task, TaskStatus, TaskTestType, TaskTestResult
+from auto_dev_supervisor.domain.model import ProjectSpec, ServiceSpec, Task, TaskStatus, TaskTestType, TaskTestResult
 from auto_dev_supervisor.core.planner import Planner
 from auto_dev_supervisor.core.error_handler import EnhancedErrorHandler as ErrorHandler, ErrorCategory, ErrorSeverity
 from auto_dev_supervisor.core.progress_monitor import ProgressMonitor
 from auto_dev_supervisor.core.testing_pipeline import AutomatedTestingPipeline
 from auto_dev_supervisor.infra.opendevin import OpenDevinClient
-from auto_dev_supervisor.infra.docker import DockerManager
 from auto_dev_supervisor.infra.git import GitManager
 from auto_dev_supervisor.domain.qa import QAManager
 
+if TYPE_CHECKING:
+    # Only for annotations: the docker SDK is not needed when running with skip_docker
+    from auto_dev_supervisor.infra.docker import DockerManager
+
 console = Console()
 
 class Supervisor:
@@ -20,7 +23,7 @@ class Supervisor:
         self, 
         planner: Planner,
         opendevin: OpenDevinClient,
-        docker_manager: DockerManager,
+        docker_manager: Optional["DockerManager"],
         git_manager: GitManager,
         qa_manager: QAManager,
         project_root: str = ".",
@@ -54,7 +57,8 @@ class Supervisor:
             console.print(f"Generated {len(tasks)} tasks.")
             
             # 3. Generate Docker Compose
-            self.docker_manager.generate_compose_file(spec)
+            if self.docker_manager is not None:
+                self.docker_manager.generate_compose_file(spec)
             
             # 4. Start Progress Monitoring
             self.progress_monitor.start_monitoring(len(tasks))
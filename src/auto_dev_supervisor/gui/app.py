@@ -684,8 +684,10 @@ Your YAML file should define:
             else:
                 opendevin = MockOpenDevinClient()
                 
-            self.status_var.set("Setting up Docker manager...")
-            docker_manager = DockerManager(abs_project_root)
+            docker_manager = None
+            if not self.skip_docker_var.get():
+                self.status_var.set("Setting up Docker manager...")
+                docker_manager = DockerManager(abs_project_root)
             
             self.status_var.set("Setting up Git manager...")
             # We need to parse spec to get repo url for git manager
@@ -759,6 +761,9 @@ Your YAML file should define:
             self.status_var.set("Ready")
 
 def main():
+    # Also reached without the CLI (python -m auto_dev_supervisor.gui.app); idempotent when it isn't
+    from auto_dev_supervisor.main import _init_logging
+    _init_logging(False)
     app = AutoDevApp()
     app.mainloop()
 
@@ -2,19 +2,21 @@ import docker
 import yaml
 import os
 import subprocess
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 from auto_dev_supervisor.domain.model import ProjectSpec, ServiceSpec, TaskTestResult, TaskTestType
 from auto_dev_supervisor.core.error_handler import EnhancedErrorHandler, ErrorCategory, ErrorSeverity
 
 class DockerManager:
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: Union[str, os.PathLike]):
         try:
             self.client = docker.from_env()
         except Exception as e:
             self.client = None
             print(f"[Docker] Failed to initialize client: {e}")
-        self.project_root = project_root
-        self.compose_file = os.path.join(project_root, "docker-compose.yml")
+        self.project_root = os.fspath(project_root)
+        self.compose_file = os.path.join(self.project_root, "docker-compose.yml")
+        # Compose names containers after the project directory
+        self._container_prefix = os.path.basename(os.path.abspath(self.project_root))
         self.last_error: str = ""
         # Lazy connectivity; avoid pinging here to prevent GUI startup failures
 
@@ -32,7 +34,7 @@ class DockerManager:
                 "image": f"{self._sanitize_name(spec.name)}-{service.name}:{spec.version}",
                 "volumes": [".:/app"],
                 "environment": ["ENV=test"],
-                "container_name": f"{os.path.basename(os.path.abspath(self.project_root))}_{service.name}_1"
+                "container_name": f"{self._container_prefix}_{service.name}_1"
             }
             # Basic resource management for local compose
             service_config["mem_limit"] = "512m"
@@ -123,7 +125,7 @@ class DockerManager:
             cmd = "python scripts/run_ml_qa.py"
             
         try:
-            target = container_id if container_id else f"{os.path.basename(self.project_root)}_{service_name}_1"
+            target = container_id if container_id else f"{self._container_prefix}_{service_name}_1"
             container = self.client.containers.get(target)
             exec_result = container.exec_run(cmd)
             
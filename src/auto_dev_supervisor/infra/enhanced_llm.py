@@ -1,15 +1,46 @@
 import os
 import time
-import json
+import logging
+import base64
 import hashlib
-from typing import Optional, List, Dict, Any
+import random
+import threading
+from collections import OrderedDict, deque
+from typing import Optional, List, Dict, Any, Iterable, Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from openai import OpenAI
+from openai import OpenAI, RateLimitError, APITimeoutError, InternalServerError
 from auto_dev_supervisor.domain.model import Task, TaskTestResult
-from auto_dev_supervisor.infra.llm import GenAIOpenDevinClient
+from auto_dev_supervisor.infra.jsonutil import dumps, loads
+from auto_dev_supervisor.infra.llm import GenAIOpenDevinClient, _CodeBlockStreamParser, _CODE_BLOCK_RE, _SYSTEM_EXECUTE, _SYSTEM_FIX, _messages
 from auto_dev_supervisor.core.config import ConfigManager
 from auto_dev_supervisor.core.error_handler import EnhancedErrorHandler, ErrorCategory, ErrorSeverity
 
+try:
+    import zstandard
+except ImportError:  # Optional: cached responses are stored uncompressed without it
+    zstandard = None
+
+log = logging.getLogger("auto_dev_supervisor.llm")
+
+# Number of past fix_issues error contexts kept for similarity lookups
+ERROR_HISTORY_LIMIT = 50
+
+# Transient provider errors that are retried against the same provider before falling back
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, InternalServerError)
+MAX_PROVIDER_ATTEMPTS = 3
+# Longest retry-after we honor; beyond it, waiting out the provider beats failing over
+MAX_RETRY_DELAY = 30.0
+
+# Cached responses at least this long are zstd-compressed (when available) before persistence
+CACHE_COMPRESS_MIN_CHARS = 1024
+ZSTD_PREFIX = "zstd:"
+
+# Streamed characters between progress log lines
+STREAM_PROGRESS_CHARS = 2000
+
+# Self-review results remembered per (prompt, generated content) pair
+REVIEW_CACHE_LIMIT = 128
+
 class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
     """
     Enhanced LLM client with speed optimizations and iterative error resolution.
@@ -35,12 +66,19 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
         self.retry_delay = retry_delay
         self.cache_dir = os.path.join(os.path.expanduser("~"), ".auto-dev", "cache")
         self.response_cache = {}
-        self.error_context_history = []
+        self.error_context_history = deque(maxlen=ERROR_HISTORY_LIMIT)
+        self.error_log_file = os.path.join(self.cache_dir, "errors.jsonl")
+        self._zctx = zstandard.ZstdCompressor(level=3) if zstandard else None
+        self._zdctx = zstandard.ZstdDecompressor() if zstandard else None
+        self._review_cache: "OrderedDict[str, str]" = OrderedDict()
+        # Guards response_cache and its file: tasks may run on several threads at once
+        self._cache_lock = threading.Lock()
         
         # Ensure cache directory exists
         if self.enable_cache:
             os.makedirs(self.cache_dir, exist_ok=True)
             self._load_cache()
+            self._load_error_history()
     
     def _get_cache_key(self, prompt: str, task_id: str) -> str:
         """Generate cache key from prompt and task ID"""
@@ -52,10 +90,10 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
         cache_file = os.path.join(self.cache_dir, f"{self.provider}_{self.model}.json")
         if os.path.exists(cache_file):
             try:
-                with open(cache_file, 'r') as f:
-                    self.response_cache = json.load(f)
+                with open(cache_file, 'r', encoding='utf-8') as f:
+                    self.response_cache = loads(f.read())
             except Exception as e:
-                print(f"[Cache] Failed to load cache: {e}")
+                log.warning(f"[Cache] Failed to load cache: {e}")
                 self.response_cache = {}
     
     def _save_cache(self):
@@ -64,11 +102,49 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
             return
             
         cache_file = os.path.join(self.cache_dir, f"{self.provider}_{self.model}.json")
+        tmp_file = f"{cache_file}.tmp"
+        try:
+            with self._cache_lock:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    f.write(dumps(self.response_cache))
+                # Readers never see a half-written file
+                os.replace(tmp_file, cache_file)
+        except Exception as e:
+            log.warning(f"[Cache] Failed to save cache: {e}")
+    
+    def _load_error_history(self):
+        """Load recent error contexts from the append-only error log"""
+        if not os.path.exists(self.error_log_file):
+            return
+        line_count = 0
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(self.response_cache, f)
+            with open(self.error_log_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line_count += 1
+                    if line.strip():
+                        self.error_context_history.append(loads(line))
         except Exception as e:
-            print(f"[Cache] Failed to save cache: {e}")
+            log.warning(f"[Cache] Failed to load error history: {e}")
+            return
+        # Compact the log once it grows well past what we keep in memory
+        if line_count > ERROR_HISTORY_LIMIT * 10:
+            try:
+                with open(self.error_log_file, 'w', encoding='utf-8') as f:
+                    for error_ctx in self.error_context_history:
+                        f.write(dumps(error_ctx) + "\n")
+            except Exception as e:
+                log.warning(f"[Cache] Failed to compact error history: {e}")
+    
+    def _record_error_context(self, error_ctx: Dict[str, Any]):
+        """Remember an error context in memory and append it to the error log"""
+        self.error_context_history.append(error_ctx)
+        if not self.enable_cache:
+            return
+        try:
+            with open(self.error_log_file, 'a', encoding='utf-8') as f:
+                f.write(dumps(error_ctx) + "\n")
+        except Exception as e:
+            log.warning(f"[Cache] Failed to persist error history: {e}")
     
     def _get_cached_response(self, cache_key: str) -> Optional[str]:
         """Get cached response if available"""
@@ -77,33 +153,57 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
         
         cached = self.response_cache.get(cache_key)
         if cached:
-            print(f"[Cache] Cache hit for key: {cache_key[:8]}...")
+            cached = self._decompress(cached)
+        if cached:
+            log.info(f"[Cache] Cache hit for key: {cache_key[:8]}...")
             return cached
         return None
     
+    def _compress(self, response: str) -> str:
+        """zstd-compress a large response into a base64 string tagged with ZSTD_PREFIX"""
+        if self._zctx is None or len(response) < CACHE_COMPRESS_MIN_CHARS:
+            return response
+        packed = self._zctx.compress(response.encode("utf-8"))
+        return ZSTD_PREFIX + base64.b64encode(packed).decode("ascii")
+    
+    def _decompress(self, stored: str) -> Optional[str]:
+        """Inverse of _compress; returns None if the entry can't be decoded here"""
+        if not stored.startswith(ZSTD_PREFIX):
+            return stored
+        if self._zdctx is None:
+            return None
+        try:
+            packed = base64.b64decode(stored[len(ZSTD_PREFIX):])
+            return self._zdctx.decompress(packed).decode("utf-8")
+        except Exception as e:
+            log.warning(f"[Cache] Failed to decompress cache entry: {e}")
+            return None
+    
     def _cache_response(self, cache_key: str, response: str):
         """Cache response for future use"""
         if not self.enable_cache:
             return
         
-        self.response_cache[cache_key] = response
-        # Limit cache size to prevent memory issues
-        if len(self.response_cache) > 1000:
-            # Remove oldest entries
-            keys_to_remove = list(self.response_cache.keys())[:500]
-            for key in keys_to_remove:
-                del self.response_cache[key]
+        compressed = self._compress(response)
+        with self._cache_lock:
+            self.response_cache[cache_key] = compressed
+            # Limit cache size to prevent memory issues
+            if len(self.response_cache) > 1000:
+                # Remove oldest entries
+                keys_to_remove = list(self.response_cache.keys())[:500]
+                for key in keys_to_remove:
+                    del self.response_cache[key]
     
     def execute_task(self, task: Task, context: str) -> str:
         """Enhanced task execution with caching and streaming"""
-        print(f"[EnhancedGenAI] Starting task execution: {task.title} (ID: {task.id})")
-        print(f"[EnhancedGenAI] Provider: {self.provider}, Model: {self.model}")
-        print(f"[EnhancedGenAI] Service: {task.service_name}")
-        print(f"[EnhancedGenAI] Streaming: {self.enable_streaming}, Cache: {self.enable_cache}")
+        log.info(f"[EnhancedGenAI] Starting task execution: {task.title} (ID: {task.id})")
+        log.info(f"[EnhancedGenAI] Provider: {self.provider}, Model: {self.model}")
+        log.info(f"[EnhancedGenAI] Service: {task.service_name}")
+        log.info(f"[EnhancedGenAI] Streaming: {self.enable_streaming}, Cache: {self.enable_cache}")
         
         if not self.client and self.provider != "gemini":
             error_message = f"No API Key provided for {self.provider} client"
-            print(f"[EnhancedGenAI] Error: {error_message}")
+            log.error(f"[EnhancedGenAI] Error: {error_message}")
             return f"Error: {error_message}"
         
         prompt = self._construct_prompt(task, context)
@@ -112,21 +212,28 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
         # Check cache first
         cached_response = self._get_cached_response(cache_key)
         if cached_response:
-            print(f"[EnhancedGenAI] Using cached response")
+            log.info(f"[EnhancedGenAI] Using cached response")
             return cached_response
         
+        # The in-flight map is shared by all clients, so scope the key to this provider and project
+        inflight_key = f"{self.provider}|{self.model}|{self.project_root}|{cache_key}"
+        return self._coalesce(inflight_key, lambda: self._execute_uncached(task, context, prompt, cache_key))
+    
+    def _execute_uncached(self, task: Task, context: str, prompt: str, cache_key: str) -> str:
+        """Generate, review and cache a response for a prompt that missed the cache"""
         # Execute with enhanced error handling and streaming
         try:
-            content = self._execute_with_streaming(task, prompt, cache_key)
+            content = self._execute_with_retries(task, prompt, cache_key)
             
-            # Apply self-review for quality improvement
+            # Apply self-review for quality improvement, unless the response already passes the quick checks
             try:
-                review_feedback = self._enhanced_self_review(content, task, context)
-                if review_feedback and "```" in review_feedback:
-                    print("[EnhancedGenAI] Applying enhanced self-review fixes")
-                    content = review_feedback
+                if self._quick_lint(content, task):
+                    review_feedback = self._enhanced_self_review(content, task, context, prompt_hash=cache_key)
+                    if review_feedback and "```" in review_feedback:
+                        log.info("[EnhancedGenAI] Applying enhanced self-review fixes")
+                        content = review_feedback
             except Exception as e:
-                print(f"[EnhancedGenAI] Self-review failed (non-critical): {e}")
+                log.warning(f"[EnhancedGenAI] Self-review failed (non-critical): {e}")
             
             # Cache the final response
             self._cache_response(cache_key, content)
@@ -139,14 +246,38 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
                 e, {"provider": self.provider, "model": self.model, "task_id": task.id, 
                    "service_name": task.service_name, "phase": "execute_task"}
             )
-            print(f"[EnhancedGenAI] Error calling LLM: {error.message}")
+            log.error(f"[EnhancedGenAI] Error calling LLM: {error.message}")
             
             # Try alternate providers with parallel processing
             return self._try_parallel_providers(task, context, error.message)
     
+    def _execute_with_retries(self, task: Task, prompt: str, cache_key: str) -> str:
+        """Retry transient errors (429, timeouts, 5xx) on the current provider with jittered backoff"""
+        for attempt in range(MAX_PROVIDER_ATTEMPTS):
+            try:
+                return self._call_provider(lambda: self._execute_with_streaming(task, prompt, cache_key))
+            except RETRYABLE_ERRORS as e:
+                if attempt == MAX_PROVIDER_ATTEMPTS - 1:
+                    raise
+                delay = self._retry_delay_for(e, attempt)
+                log.warning(f"[EnhancedGenAI] {type(e).__name__} from {self.provider}, retrying in {delay:.1f}s "
+                            f"(attempt {attempt + 2}/{MAX_PROVIDER_ATTEMPTS})")
+                time.sleep(delay)
+    
+    def _retry_delay_for(self, error: Exception, attempt: int) -> float:
+        """Honor the provider's retry-after header, else exponential backoff with jitter"""
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_RETRY_DELAY)
+            except ValueError:
+                pass
+        return min(self.retry_delay * (2 ** attempt) + random.uniform(0, self.retry_delay), MAX_RETRY_DELAY)
+    
     def _execute_with_streaming(self, task: Task, prompt: str, cache_key: str) -> str:
         """Execute with streaming for faster perceived performance"""
-        print(f"[EnhancedGenAI] Constructed prompt length: {len(prompt)} characters")
+        log.info(f"[EnhancedGenAI] Constructed prompt length: {len(prompt)} characters")
         
         if self.provider == "gemini":
             return self._execute_gemini_streaming(task, prompt)
@@ -158,65 +289,83 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
         if not self.client:
             raise Exception("Gemini client not initialized")
         
-        print(f"[EnhancedGenAI] Calling Gemini API with streaming...")
+        log.info(f"[EnhancedGenAI] Calling Gemini API with streaming...")
         
         # Use streaming for Gemini
         response = self.client.generate_content(prompt, stream=self.enable_streaming)
         
-        content = ""
         if self.enable_streaming:
-            print("[EnhancedGenAI] Streaming response...")
-            for chunk in response:
-                if chunk.text:
-                    content += chunk.text
-                    # Update progress (for GUI feedback)
-                    print(f"[Streaming] Received {len(content)} chars...\r", end="")
-            print()  # New line after streaming
+            log.info("[EnhancedGenAI] Streaming response...")
+            content = self._consume_stream(
+                self._with_progress(chunk.text for chunk in response), _CodeBlockStreamParser(self._write_file)
+            )
+            log.info(f"[EnhancedGenAI] Received response length: {len(content)} characters")
         else:
             content = response.text
-        
-        print(f"[EnhancedGenAI] Received response length: {len(content)} characters")
-        self._parse_and_write_files(content)
+            log.info(f"[EnhancedGenAI] Received response length: {len(content)} characters")
+            self._parse_and_write_files(content)
         return content
     
     def _execute_openai_streaming(self, task: Task, prompt: str) -> str:
         """Execute with OpenAI-compatible streaming"""
-        print(f"[EnhancedGenAI] Calling {self.provider} API with model {self.model}...")
+        log.info(f"[EnhancedGenAI] Calling {self.provider} API with model {self.model}...")
         
-        messages = [
-            {"role": "system", "content": "You are OpenDevin, an autonomous AI software engineer. You write production-ready code. When you write code, output it in markdown code blocks. IMPORTANT: The first line of every code block MUST be a comment containing the filename, e.g. `## filename: src/main.py` or `# filename: Dockerfile`. You must write the full content of the file."},
-            {"role": "user", "content": prompt}
-        ]
+        messages = _messages(_SYSTEM_EXECUTE, prompt)
+        # _execute_with_retries owns retrying this call; stacking the SDK's own retries on top
+        # would turn one 429 into up to 9 requests before falling back
+        client = self.client.with_options(max_retries=0)
         
         if self.enable_streaming:
-            print("[EnhancedGenAI] Using streaming for faster response...")
-            response = self.client.chat.completions.create(
+            log.info("[EnhancedGenAI] Using streaming for faster response...")
+            response = client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 stream=True
             )
             
-            content = ""
-            print("[EnhancedGenAI] Streaming response...")
-            for chunk in response:
-                if chunk.choices[0].delta.content:
-                    content += chunk.choices[0].delta.content
-                    # Update progress (for GUI feedback)
-                    print(f"[Streaming] Received {len(content)} chars...\r", end="")
-            print()  # New line after streaming
+            log.info("[EnhancedGenAI] Streaming response...")
+            # Blocks are written to disk while later ones are still being generated
+            content = self._consume_stream(
+                self._with_progress(chunk.choices[0].delta.content for chunk in response if chunk.choices),
+                _CodeBlockStreamParser(self._write_file)
+            )
+            log.info(f"[EnhancedGenAI] Received response length: {len(content)} characters")
         else:
-            response = self.client.chat.completions.create(
+            response = client.chat.completions.create(
                 model=self.model,
                 messages=messages
             )
             content = response.choices[0].message.content
-        
-        print(f"[EnhancedGenAI] Received response length: {len(content)} characters")
-        self._parse_and_write_files(content)
+            log.info(f"[EnhancedGenAI] Received response length: {len(content)} characters")
+            self._parse_and_write_files(content)
         return content
+
+    def _with_progress(self, pieces: Iterable[Optional[str]]) -> Iterator[Optional[str]]:
+        """Pass streamed pieces through while logging a running character count every STREAM_PROGRESS_CHARS."""
+        received = 0
+        reported = 0
+        for piece in pieces:
+            if piece:
+                received += len(piece)
+                if received - reported >= STREAM_PROGRESS_CHARS:
+                    reported = received
+                    log.debug(f"[Streaming] Received {received} chars...")
+            yield piece
     
-    def _enhanced_self_review(self, content: str, task: Task, original_context: str) -> str:
+    def _enhanced_self_review(self, content: str, task: Task, original_context: str,
+                              prompt_hash: Optional[str] = None) -> str:
         """Enhanced self-review with context awareness"""
+        # The review is fully determined by the originating prompt and the generated content,
+        # so reuse the prompt's cache key and hash only the content to look up earlier reviews
+        review_key = None
+        if prompt_hash and self.enable_cache:
+            content_hash = hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+            review_key = hashlib.blake2b(f"{prompt_hash}:{content_hash}".encode(), digest_size=16).hexdigest()
+            if review_key in self._review_cache:
+                log.info(f"[EnhancedGenAI] Reusing self-review for key: {review_key[:8]}...")
+                self._review_cache.move_to_end(review_key)
+                return self._review_cache[review_key]
+        
         review_prompt = f"""
         You are reviewing code generated by OpenDevin for task: {task.title}
         
@@ -243,27 +392,30 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
             else:
                 response = self.client.chat.completions.create(
                     model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a code reviewer. Provide concise feedback and corrections."},
-                        {"role": "user", "content": review_prompt}
-                    ]
+                    messages=_messages("You are a code reviewer. Provide concise feedback and corrections.", review_prompt)
                 )
                 review_result = response.choices[0].message.content
             
             if "CODE_OK" in review_result:
-                return content
-            elif "```" in review_result:
-                return review_result
+                reviewed = content
+            elif _CODE_BLOCK_RE.search(review_result):
+                reviewed = review_result
             else:
-                return content
+                reviewed = content
+            
+            if review_key:
+                self._review_cache[review_key] = reviewed
+                if len(self._review_cache) > REVIEW_CACHE_LIMIT:
+                    self._review_cache.popitem(last=False)
+            return reviewed
                 
         except Exception as e:
-            print(f"[EnhancedGenAI] Self-review failed: {e}")
+            log.warning(f"[EnhancedGenAI] Self-review failed: {e}")
             return content
     
     def _try_parallel_providers(self, task: Task, context: str, original_error: str) -> str:
         """Try multiple providers in parallel for faster fallback"""
-        print(f"[EnhancedGenAI] Attempting parallel provider fallback...")
+        log.info(f"[EnhancedGenAI] Attempting parallel provider fallback...")
         
         # Define fallback providers
         fallback_providers = [
@@ -275,7 +427,7 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
         # Filter out current provider and unavailable ones
         available_providers = []
         for provider, model in fallback_providers:
-            if provider != self.provider:  # Don't retry same provider
+            if provider != self.provider and not self._circuit.is_open(provider):  # Don't retry same or tripped providers
                 key = self.config_manager.get_api_key(provider)
                 if key or provider == "ollama":  # Ollama doesn't need API key
                     available_providers.append((provider, model))
@@ -283,7 +435,7 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
         if not available_providers:
             return f"Error calling LLM: {original_error} (No fallback providers available)"
         
-        print(f"[EnhancedGenAI] Trying {len(available_providers)} fallback providers in parallel...")
+        log.info(f"[EnhancedGenAI] Trying {len(available_providers)} fallback providers in parallel...")
         
         with ThreadPoolExecutor(max_workers=min(len(available_providers), self.max_parallel_requests)) as executor:
             futures = {}
@@ -297,11 +449,11 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
                     result = future.result()
                     if result and not result.startswith("Error"):
                         provider, model = futures[future]
-                        print(f"[EnhancedGenAI] Fallback provider {provider}/{model} succeeded")
+                        log.info(f"[EnhancedGenAI] Fallback provider {provider}/{model} succeeded")
                         return result
                 except Exception as e:
                     provider, model = futures[future]
-                    print(f"[EnhancedGenAI] Fallback provider {provider}/{model} failed: {e}")
+                    log.warning(f"[EnhancedGenAI] Fallback provider {provider}/{model} failed: {e}")
         
         return f"Error calling LLM: {original_error} (All fallback providers failed)"
     
@@ -316,11 +468,11 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
     
     def fix_issues(self, task: Task, errors: str) -> str:
         """Enhanced issue fixing with iterative improvement"""
-        print(f"[EnhancedGenAI] Fixing issues for task: {task.title}")
-        print(f"[EnhancedGenAI] Errors: {errors[:100]}...")
+        log.info(f"[EnhancedGenAI] Fixing issues for task: {task.title}")
+        log.info(f"[EnhancedGenAI] Errors: {errors[:100]}...")
         
-        # Store error context for learning
-        self.error_context_history.append({
+        # Store error context for learning (bounded deque, persisted across runs)
+        self._record_error_context({
             "task_id": task.id,
             "task_title": task.title,
             "service_name": task.service_name,
@@ -328,10 +480,6 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
             "timestamp": time.time()
         })
         
-        # Keep only recent error history (last 50)
-        if len(self.error_context_history) > 50:
-            self.error_context_history = self.error_context_history[-50:]
-        
         # Find similar past errors for context
         similar_errors = self._find_similar_errors(errors, task.service_name)
         
@@ -355,17 +503,12 @@ class EnhancedGenAIOpenDevinClient(GenAIOpenDevinClient):
             if self.provider == "gemini":
                 if not self.client:
                     raise Exception("Gemini client not initialized")
-                response = self.client.generate_content(enhanced_prompt)
-                content = response.text
+                content = self._call_provider(lambda: self.client.generate_content(enhanced_prompt).text)
             else:
-                response = self.client.chat.completions.create(
+                content = self._call_provider(lambda: self.client.chat.completions.create(
                     model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are OpenDevin. Fix the bugs based on the error logs provided. Output full file contents. IMPORTANT: The first line of every code block MUST be a comment containing the filename, e.g. `## filename: src/main.py`."},
-                        {"role": "user", "content": enhanced_prompt}
-                    ]
-                )
-                content = response.choices[0].message.content
+                    messages=_messages(_SYSTEM_FIX, enhanced_prompt)
+                ).choices[0].message.content)
             
             self._parse_and_write_files(content)
             return content
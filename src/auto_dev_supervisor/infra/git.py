@@ -1,11 +1,11 @@
 import git
 import os
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 from auto_dev_supervisor.domain.model import Task, TaskTestResult
 
 class GitManager:
-    def __init__(self, project_root: str, repo_url: str, branch: str = "main"):
-        self.project_root = project_root
+    def __init__(self, project_root: Union[str, os.PathLike], repo_url: str, branch: str = "main"):
+        self.project_root = os.fspath(project_root)
         self.repo_url = repo_url
         self.branch = branch
         self.repo = self._init_repo()
@@ -25,12 +25,22 @@ class GitManager:
         Commits changes with a detailed message.
         Returns True if commit was successful (or nothing to commit).
         """
-        if not self.repo.is_dirty(untracked_files=True):
+        changes = self._read_status()
+        if not changes:
             return True
 
-        self.repo.git.add(A=True)
+        # Stage through the index API instead of `git add -A`; the same status entries feed the
+        # commit message below. Only the worktree column (code[1]) needs staging: entries whose
+        # index column already shows the change (e.g. "D ", "M ") are left as they are.
+        # Deletions still go through `git rm --cached`, which is how IndexFile.remove works.
+        removed = [path for code, path in changes if code[1] == "D" and code[0] != "D"]
+        staged = [path for code, path in changes if code[1] not in " D"]
+        if removed:
+            self.repo.index.remove(removed)
+        if staged:
+            self.repo.index.add(staged)
         
-        message = self._generate_commit_message(task, test_results)
+        message = self._generate_commit_message(task, test_results, changes)
         
         try:
             self.repo.index.commit(message)
@@ -39,6 +49,25 @@ class GitManager:
             print(f"Commit failed: {e}")
             return False
 
+    def _read_status(self) -> List[Tuple[str, str]]:
+        """
+        Returns (status code, path) pairs for every changed or untracked file,
+        read from a single `git status --porcelain=v1 -z` call.
+        """
+        # -uall lists each file in a new directory instead of collapsing it to "dir/"
+        out = self.repo.git.status("--porcelain=v1", "-z", "--untracked-files=all")
+        entries = iter(out.split("\x00"))
+        changes = []
+        for entry in entries:
+            if not entry:
+                continue
+            code, path = entry[:2], entry[3:]
+            if code[0] in "RC":
+                # Renames/copies are followed by the original path as its own entry
+                next(entries, None)
+            changes.append((code, path))
+        return changes
+
     def push_changes(self) -> bool:
         try:
             # In a real scenario, we'd handle auth. 
@@ -52,20 +81,25 @@ class GitManager:
             # or if we are in a simulated environment where we can't actually push.
             return True
 
-    def _generate_commit_message(self, task: Task, test_results: List[TaskTestResult]) -> str:
+    def _generate_commit_message(self, task: Task, test_results: List[TaskTestResult],
+                                 changes: Optional[List[Tuple[str, str]]] = None) -> str:
         lines = []
         lines.append(f"feat: Complete task {task.id}")
         lines.append("")
         lines.append(f"Task: {task.id} - {task.title}")
         lines.append("Files changed:")
         
-        # Get changed files
-        diff = self.repo.index.diff("HEAD")
-        for d in diff:
-            lines.append(f"  - {d.a_path} (modified)")
-        # Untracked files
-        for f in self.repo.untracked_files:
-            lines.append(f"  - {f} (added)")
+        # Get changed files (reuse the status read while staging when given)
+        if changes is None:
+            changes = self._read_status()
+        for code, path in changes:
+            if code == "??" or "A" in code:
+                state = "added"
+            elif "D" in code:
+                state = "deleted"
+            else:
+                state = "modified"
+            lines.append(f"  - {path} ({state})")
             
         lines.append("Test summary:")
         for result in test_results:
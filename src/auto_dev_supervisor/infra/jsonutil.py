@@ -0,0 +1,27 @@
+"""
+JSON helpers backed by orjson when it is installed, with a stdlib fallback.
+"""
+
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # Optional: the stdlib json module is used without it
+    orjson = None
+    import json
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> str:
+    """
+    Compact JSON text. The stdlib fallback uses the same separators and unescaped
+    UTF-8 as orjson, so e.g. cache keys built from it don't depend on which is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0).decode("utf-8")
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False)
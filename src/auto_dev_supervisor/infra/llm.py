@@ -1,19 +1,447 @@
 import os
-from typing import Optional, List
-from openai import OpenAI
+import re
+import sys
+import logging
+import hashlib
+import asyncio
+import time
+import threading
+import importlib.util
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, List, Tuple
+import httpx
+from openai import DEFAULT_TIMEOUT, OpenAI, AsyncOpenAI, APIConnectionError, APIError, APIStatusError, RateLimitError
 # import google.generativeai as genai # Moved to lazy import due to protobuf issues on some python versions
 from auto_dev_supervisor.domain.model import Task, TaskTestResult
 from auto_dev_supervisor.infra.opendevin import OpenDevinClient
+from auto_dev_supervisor.infra.llm_cache import LLMCache
+from auto_dev_supervisor.infra.jsonutil import loads
 from auto_dev_supervisor.core.config import ConfigManager
 from auto_dev_supervisor.core.error_handler import EnhancedErrorHandler, ErrorCategory, ErrorSeverity
 
+log = logging.getLogger("auto_dev_supervisor.llm")
+
+# System prompts are module constants so every request carries a byte-identical prefix,
+# which is what lets providers with prompt/prefix caching reuse the prefill across calls.
+_SYSTEM_EXECUTE = (
+    "You are OpenDevin, an autonomous AI software engineer. You write production-ready code. "
+    "When you write code, output it in markdown code blocks. IMPORTANT: The first line of every code block "
+    "MUST be a comment containing the filename, e.g. `## filename: src/main.py` or `# filename: Dockerfile`. "
+    "You must write the full content of the file."
+)
+_SYSTEM_FIX = (
+    "You are OpenDevin. Fix the bugs based on the error logs provided. Output full file contents. "
+    "IMPORTANT: The first line of every code block MUST be a comment containing the filename, "
+    "e.g. `## filename: src/main.py`."
+)
+_SYSTEM_REVIEW = "You are OpenDevin performing a self-review."
+_SYSTEM_FALLBACK = (
+    "You are OpenDevin, an autonomous AI software engineer. "
+    "Output full files in code blocks with filenames."
+)
+
+# Message keys and roles are interned once; every request's message dicts share these objects
+ROLE_KEY = sys.intern("role")
+CONTENT_KEY = sys.intern("content")
+ROLE_SYS = sys.intern("system")
+ROLE_USER = sys.intern("user")
+
+def _messages(system: str, user: str) -> List[Dict[str, str]]:
+    """Chat messages for a system + user prompt pair."""
+    return [{ROLE_KEY: ROLE_SYS, CONTENT_KEY: system}, {ROLE_KEY: ROLE_USER, CONTENT_KEY: user}]
+
+# Markdown code blocks: ```lang ... ``` - language in group 1, code in group 2
+_CODE_BLOCK_RE = re.compile(r"```(\w*)\n(.*?)```", re.DOTALL)
+# "filename: <name>" comment on the first line of a block (#, //, -- or plain text prefixes)
+_FILENAME_COMMENT_RE = re.compile(r"filename:\s*([a-zA-Z0-9_./-]+)", re.IGNORECASE)
+# A path or Dockerfile name mentioned on the line just before a block
+_PRECEDING_FILENAME_RE = re.compile(r"([a-zA-Z0-9_./-]+\.[a-zA-Z0-9]+|Dockerfile(?:\.[a-zA-Z0-9_-]+)?)")
+# How many characters before a block are searched for that line
+_PRECEDING_WINDOW = 200
+
+# Context windows (tokens) by model name prefix; the longest matching prefix wins.
+# Models not listed here get their context unbudgeted rather than a guessed window.
+_MODEL_CONTEXT_TOKENS = {
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "gemini-1.5": 1048576,
+    "grok": 131072,
+    "llama3.1": 131072,
+    "llama3": 8192,
+    "llama2": 4096,
+    "mixtral": 32768,
+    "qwen2.5-coder": 32768,
+    "codellama": 16384,
+    "deepseek-coder": 16384,
+}
+# Tokens kept free for the completion when budgeting prompt context, capped at a
+# quarter of the window so small-window models still have room for context
+MAX_OUTPUT_TOKENS = 4096
+# Context is never budgeted below this many tokens, however large the prompt template
+MIN_CONTEXT_TOKENS = 1024
+_TRUNCATION_MARKER = "\n...[truncated]...\n"
+
+# cl100k_base encoding from the optional tiktoken package; False once the import has failed
+_ENCODING = None
+
+# Generated files are written through one large buffer instead of many small flushes
+WRITE_BUFFER_SIZE = 1024 * 1024
+# How many recently written files are remembered to skip identical rewrites
+WRITTEN_FILES_LIMIT = 1024
+
+# One pooled HTTP client shared by every OpenAI-compatible client so repeated calls
+# to the same host reuse keep-alive TCP/TLS connections. Created on first use.
+_HTTP_CLIENT: Optional[httpx.Client] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+# OpenAI-compatible clients keyed by (base_url, api_key), reused across client instances
+_OPENAI_CLIENTS: Dict[Tuple[Optional[str], str], OpenAI] = {}
+_OPENAI_CLIENTS_LOCK = threading.Lock()
+
+# google.generativeai module, imported and configured on first Gemini use
+_GENAI = None
+_GENAI_API_KEY: Optional[str] = None
+_GENAI_LOCK = threading.Lock()
+
+# Installed Ollama model names, refreshed at most every OLLAMA_TAGS_TTL seconds
+OLLAMA_TAGS_TTL = 30.0
+_OLLAMA_TAGS_CACHE = {"ts": 0.0, "names": []}
+_OLLAMA_TAGS_LOCK = threading.Lock()
+
+# OpenAI-compatible providers: endpoint, fallback model and whether a real API key is required
+_PROVIDER_SPECS: Dict[str, Dict] = {
+    "openai": {"base_url": None, "model": "gpt-4-turbo", "needs_key": True},
+    "ollama": {"base_url": "http://localhost:11434/v1", "model": "llama3.1", "needs_key": False},
+    "grok": {"base_url": "https://api.x.ai/v1", "model": "grok-beta", "needs_key": True},
+}
+
+# Worker threads for blocking LLM calls made from async code (execute_task_async),
+# sized by AUTO_DEV_LLM_CONC and created on first use
+LLM_CONC_ENV_VAR = "AUTO_DEV_LLM_CONC"
+DEFAULT_LLM_CONC = 8
+_LLM_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_LLM_EXECUTOR_LOCK = threading.Lock()
+
+# Upper bound for a single alternate-provider request while racing fallbacks
+ALTERNATE_PROVIDER_TIMEOUT = 120.0
+
+def _get_http_client() -> httpx.Client:
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None:
+                _HTTP_CLIENT = httpx.Client(
+                    # HTTP/2 needs the optional `h2` package
+                    http2=importlib.util.find_spec("h2") is not None,
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                    limits=httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60),
+                )
+    return _HTTP_CLIENT
+
+def _llm_concurrency() -> int:
+    raw = os.getenv(LLM_CONC_ENV_VAR)
+    if raw is None:
+        return DEFAULT_LLM_CONC
+    try:
+        workers = int(raw)
+    except ValueError:
+        log.warning(f"[GenAI] Ignoring non-integer {LLM_CONC_ENV_VAR}={raw!r}; using {DEFAULT_LLM_CONC}")
+        return DEFAULT_LLM_CONC
+    if workers < 1:
+        log.warning(f"[GenAI] {LLM_CONC_ENV_VAR}={workers} is below 1; using 1")
+        return 1
+    return workers
+
+def _get_llm_executor() -> ThreadPoolExecutor:
+    global _LLM_EXECUTOR
+    if _LLM_EXECUTOR is None:
+        with _LLM_EXECUTOR_LOCK:
+            if _LLM_EXECUTOR is None:
+                _LLM_EXECUTOR = ThreadPoolExecutor(max_workers=_llm_concurrency(), thread_name_prefix="llm")
+    return _LLM_EXECUTOR
+
+def _get_or_create_client(base_url: Optional[str], api_key: str) -> OpenAI:
+    key = (base_url, api_key)
+    with _OPENAI_CLIENTS_LOCK:
+        client = _OPENAI_CLIENTS.get(key)
+        if client is None:
+            # Without an explicit timeout the SDK would adopt the pool's 60s one; full-file
+            # generations on slow or local models need the SDK's default read timeout
+            client = OpenAI(base_url=base_url, api_key=api_key, timeout=DEFAULT_TIMEOUT, http_client=_get_http_client())
+            _OPENAI_CLIENTS[key] = client
+        return client
+
+def _get_ollama_tags() -> List[str]:
+    """Model names from the local Ollama /api/tags endpoint, cached for OLLAMA_TAGS_TTL seconds."""
+    with _OLLAMA_TAGS_LOCK:
+        if time.time() - _OLLAMA_TAGS_CACHE["ts"] < OLLAMA_TAGS_TTL:
+            return _OLLAMA_TAGS_CACHE["names"]
+        names = []
+        try:
+            resp = _get_http_client().get("http://localhost:11434/api/tags", timeout=2)
+            resp.raise_for_status()
+            tags = loads(resp.content)
+            models = tags.get("models", []) if isinstance(tags, dict) else tags
+            if isinstance(models, list):
+                for m in models:
+                    n = m.get("name") or m.get("tag") or ""
+                    if n:
+                        names.append(n)
+        except Exception:
+            # An unreachable server is cached too, so we don't pay the timeout on every init
+            pass
+        _OLLAMA_TAGS_CACHE["ts"] = time.time()
+        _OLLAMA_TAGS_CACHE["names"] = names
+        return names
+
+def _get_encoding():
+    """tiktoken's cl100k_base encoding (an approximation for non-OpenAI models), or None without tiktoken."""
+    global _ENCODING
+    if _ENCODING is None:
+        try:
+            import tiktoken
+            _ENCODING = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _ENCODING = False
+    return _ENCODING or None
+
+def _count_tokens(text: str) -> int:
+    enc = _get_encoding()
+    if enc is None:
+        # Roughly four characters per token for English text and code
+        return len(text) // 4
+    return len(enc.encode(text, disallowed_special=()))
+
+def _context_window(model: Optional[str]) -> Optional[int]:
+    """The model's context window in tokens, or None when the model isn't in the table."""
+    best = ""
+    for prefix in _MODEL_CONTEXT_TOKENS:
+        if model and model.startswith(prefix) and len(prefix) > len(best):
+            best = prefix
+    return _MODEL_CONTEXT_TOKENS[best] if best else None
+
+def _truncate_middle(text: str, max_tokens: int) -> str:
+    """Keep the head and tail of text within max_tokens, dropping the middle."""
+    max_tokens = max(max_tokens, 0)
+    enc = _get_encoding()
+    if enc is None:
+        max_chars = max_tokens * 4
+        if len(text) <= max_chars:
+            return text
+        half = max_chars // 2
+        return text[:half] + _TRUNCATION_MARKER + (text[-half:] if half else "")
+    ids = enc.encode(text, disallowed_special=())
+    if len(ids) <= max_tokens:
+        return text
+    half = max_tokens // 2
+    return enc.decode(ids[:half]) + _TRUNCATION_MARKER + (enc.decode(ids[-half:]) if half else "")
+
+def _get_genai(api_key: str):
+    """Import google.generativeai once (lazily, it is slow and optional) and configure it for api_key."""
+    global _GENAI, _GENAI_API_KEY
+    with _GENAI_LOCK:
+        if _GENAI is None:
+            import google.generativeai as genai
+            _GENAI = genai
+        if _GENAI_API_KEY != api_key:
+            _GENAI.configure(api_key=api_key)
+            _GENAI_API_KEY = api_key
+        return _GENAI
+
+# After CIRCUIT_FAILURE_THRESHOLD failures within CIRCUIT_FAILURE_WINDOW seconds a provider is
+# skipped for CIRCUIT_COOLDOWN seconds; after that a single probe call is let through.
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_FAILURE_WINDOW = 60.0
+CIRCUIT_COOLDOWN = 30.0
+# A provider that answers 429 is skipped for longer than one that merely failed
+RATE_LIMIT_COOLDOWN = 120.0
+# Self-review is retried on 5xx responses, up to this many attempts in total
+SELF_REVIEW_ATTEMPTS = 2
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+def _is_provider_failure(error: BaseException) -> bool:
+    """
+    Whether an error says the provider itself is unhealthy: connection problems, timeouts and 5xx.
+    4xx responses come from our request or key, so they don't count against the circuit.
+    """
+    if isinstance(error, (APIConnectionError, asyncio.TimeoutError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code >= 500
+    # google-api-core errors carry the HTTP status as an int code
+    code = getattr(error, "code", None)
+    return isinstance(code, int) and code >= 500
+
+class ProviderCircuitBreaker:
+    """
+    Per-provider circuit breaker (closed -> open -> half-open) shared by all clients in the process,
+    so a provider known to be down is skipped instantly and fallbacks fire without wasted round-trips.
+    """
+
+    def __init__(self, threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 window: float = CIRCUIT_FAILURE_WINDOW, cooldown: float = CIRCUIT_COOLDOWN):
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self._state: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self) -> Dict[str, float]:
+        return {"fails": 0, "first_fail_at": 0.0, "opened_at": 0.0, "cooldown": self.cooldown}
+
+    def _entry(self, provider: str) -> Dict[str, float]:
+        return self._state.setdefault(provider, self._fresh())
+
+    def is_open(self, provider: str) -> bool:
+        """True while the provider is inside its cooldown period."""
+        with self._lock:
+            entry = self._entry(provider)
+            return bool(entry["opened_at"]) and time.time() - entry["opened_at"] < entry["cooldown"]
+
+    def allow(self, provider: str) -> bool:
+        """Whether a call may go out now; after the cooldown this admits one half-open probe."""
+        with self._lock:
+            entry = self._entry(provider)
+            if not entry["opened_at"]:
+                return True
+            now = time.time()
+            if now - entry["opened_at"] < entry["cooldown"]:
+                return False
+            # Half-open: re-arm the cooldown so only this probe goes through until it reports back
+            entry["opened_at"] = now
+            return True
+
+    def record_success(self, provider: str):
+        with self._lock:
+            self._state[provider] = self._fresh()
+
+    def trip(self, provider: str, cooldown: float):
+        """Open the circuit right away for a custom cooldown, e.g. after the provider rate-limits us."""
+        with self._lock:
+            entry = self._entry(provider)
+            entry["opened_at"] = time.time()
+            entry["cooldown"] = cooldown
+        log.warning(f"[GenAI] Circuit opened for provider {provider} for {int(cooldown)}s")
+
+    def record_failure(self, provider: str):
+        with self._lock:
+            entry = self._entry(provider)
+            now = time.time()
+            if entry["opened_at"]:
+                # A failed half-open probe keeps the circuit open for another cooldown
+                entry["opened_at"] = now
+                return
+            if now - entry["first_fail_at"] > self.window:
+                entry["fails"] = 0
+                entry["first_fail_at"] = now
+            entry["fails"] += 1
+            if entry["fails"] >= self.threshold:
+                entry["opened_at"] = now
+                entry["cooldown"] = self.cooldown
+                log.warning(f"[GenAI] Circuit opened for provider {provider} after {int(entry['fails'])} failures")
+
+class _CodeBlockStreamParser:
+    """
+    Incremental version of the markdown code-block scan: text is fed as it streams in and each
+    block is handed to write(filename, code) as soon as its closing fence arrives.
+    """
+
+    def __init__(self, write: Callable[[str, str], None], verbose: bool = True):
+        self.write = write
+        self.verbose = verbose
+        # Unprocessed text: everything after the end of the last complete block
+        self._buf = ""
+        self.blocks_found = 0
+        self.files_written = 0
+        self.written: List[str] = []
+        self.unnamed_blocks = 0
+
+    def feed(self, text: str):
+        self._buf += text
+        # A block can only complete once a backtick arrives, so plain prose skips the regex scan
+        if "`" in text:
+            self._drain()
+        if "`" not in self._buf:
+            # Outside any block only the filename lookbehind window is needed
+            self._buf = self._buf[-_PRECEDING_WINDOW:]
+
+    def close(self):
+        self._drain()
+        self._buf = ""
+        if self.verbose:
+            log.info(f"[GenAI] Found {self.blocks_found} code blocks, wrote {self.files_written} files")
+
+    def _drain(self):
+        while True:
+            match = _CODE_BLOCK_RE.search(self._buf)
+            if not match:
+                return
+            self._handle_block(match)
+            self._buf = self._buf[match.end():]
+
+    def _handle_block(self, match: "re.Match"):
+        start = match.start()
+        code = match.group(2).strip()
+        self.blocks_found += 1
+
+        filename = None
+
+        # Strategy 1: Check first line of code for "filename: <name>" pattern
+        first_line = code.partition('\n')[0].strip()
+        self._log(f"[GenAI] First line of code block {self.blocks_found}: {first_line}")
+        name_match = _FILENAME_COMMENT_RE.search(first_line)
+        if name_match:
+            filename = name_match.group(1)
+            self._log(f"[GenAI] Found filename in first line: {filename}")
+
+        # Strategy 2: Look at the last line of text before this block (Fallback).
+        # Only a bounded tail window is examined, so long prose between blocks isn't re-split.
+        if not filename:
+            tail = self._buf[max(0, start - _PRECEDING_WINDOW):start]
+            last_line = tail.rstrip().rpartition('\n')[2].strip()
+            file_match = _PRECEDING_FILENAME_RE.search(last_line)
+            if file_match:
+                filename = file_match.group(1)
+                self._log(f"[GenAI] Found filename in preceding text: {filename}")
+
+        if filename:
+            self.write(filename.strip(), code)
+            self.written.append(filename.strip())
+            self.files_written += 1
+        else:
+            self.unnamed_blocks += 1
+            if self.verbose:
+                log.warning(f"[GenAI] Warning: Could not determine filename for code block {self.blocks_found}")
+
+    def _log(self, message: str):
+        if self.verbose:
+            log.debug(message)
+
 class GenAIOpenDevinClient(OpenDevinClient):
+    # Shared across instances so every client sees the same provider health
+    _circuit = ProviderCircuitBreaker()
+    # Requests currently being made, by key, shared across instances so identical
+    # concurrent prompts (e.g. two services with the same scaffold) make one API call
+    _INFLIGHT: Dict[str, Future] = {}
+    _INFLIGHT_LOCK = threading.Lock()
+
     def __init__(self, provider: str = "openai", model: str = "gpt-4-turbo", config_manager: Optional[ConfigManager] = None, project_root: Optional[str] = None):
-        self.provider = provider
+        self.provider = sys.intern(provider)
         self.model = model
         self.config_manager = config_manager or ConfigManager()
         self.project_root = os.path.abspath(project_root) if project_root else os.getcwd()
         self.error_handler = EnhancedErrorHandler()
+        # Directories already ensured by _write_file, to skip repeated makedirs calls
+        self._created_dirs: set = set()
+        # path -> (sha1 of content, mtime_ns, size) of files this client wrote, most recent last
+        self._written: "OrderedDict[str, Tuple[str, int, int]]" = OrderedDict()
+        # Exact-match completion cache, enabled with AUTO_DEV_LLM_CACHE=1
+        self.llm_cache = LLMCache.from_env()
         
         self.api_key = self.config_manager.get_api_key(provider)
         
@@ -26,72 +454,49 @@ class GenAIOpenDevinClient(OpenDevinClient):
                 Exception(f"No API key configured for {provider}"),
                 {"provider": provider, "phase": "llm_init"}
             )
-            print(f"[Warning] {error.message}. GenAI client will fail if called.")
+            log.warning(f"[Warning] {error.message}. GenAI client will fail if called.")
             
         self.client = None
         if self.api_key:
-            if provider == "openai":
-                self.client = OpenAI(api_key=self.api_key)
-            elif provider == "ollama":
-                # Ollama local API usually runs on port 11434
-                self.client = OpenAI(
-                    base_url="http://localhost:11434/v1",
-                    api_key="ollama" # required but ignored
-                )
-                try:
-                    import urllib.request, json
-                    with urllib.request.urlopen("http://localhost:11434/api/tags", timeout=2) as resp:
-                        data = resp.read().decode("utf-8")
-                        tags = json.loads(data)
-                        names = []
-                        if isinstance(tags, dict) and "models" in tags:
-                            for m in tags["models"]:
-                                n = m.get("name") or m.get("tag") or ""
-                                if n:
-                                    names.append(n)
-                        elif isinstance(tags, list):
-                            for m in tags:
-                                n = m.get("name") or m.get("tag") or ""
-                                if n:
-                                    names.append(n)
-                        if self.model is None or self.model.strip() == "":
-                            if "llama2" in names:
-                                self.model = "llama2"
-                            elif names:
-                                self.model = names[0]
-                        elif self.model not in names and f"{self.model}:latest" in names:
-                            self.model = f"{self.model}:latest"
-                except Exception:
-                    pass
-            elif provider == "grok":
-                # xAI Grok API
-                self.client = OpenAI(
-                    base_url="https://api.x.ai/v1",
-                    api_key=self.api_key
+            if provider in _PROVIDER_SPECS:
+                spec = _PROVIDER_SPECS[provider]
+                # Ollama ignores the key but the client requires one
+                self.client = _get_or_create_client(
+                    spec["base_url"], self.api_key if spec["needs_key"] else "ollama"
                 )
+                if provider == "ollama":
+                    names = _get_ollama_tags()
+                    if self.model is None or self.model.strip() == "":
+                        if "llama2" in names:
+                            self.model = "llama2"
+                        elif names:
+                            self.model = names[0]
+                    elif self.model not in names and f"{self.model}:latest" in names:
+                        self.model = f"{self.model}:latest"
             elif provider == "gemini":
                 try:
-                    import google.generativeai as genai
-                    genai.configure(api_key=self.api_key)
+                    genai = _get_genai(self.api_key)
                     # Use gemini-1.5-flash as default if model is gpt-4-turbo (default from init) or gemini-pro (deprecated)
                     target_model = model
                     if model in ["gpt-4-turbo", "gemini-pro"]:
                         target_model = "gemini-1.5-flash"
                     
-                    self.client = genai.GenerativeModel(model_name=target_model)
-                    print(f"[GenAI] Successfully initialized Gemini client with model: {target_model}")
+                    # The execute prompt is attached once as the model's system instruction
+                    # instead of being re-sent with every request
+                    self.client = genai.GenerativeModel(model_name=target_model, system_instruction=_SYSTEM_EXECUTE)
+                    log.info(f"[GenAI] Successfully initialized Gemini client with model: {target_model}")
                 except ImportError as e:
-                    print(f"[Error] Failed to import google.generativeai: {e}")
-                    print("[Error] Please install: pip install google-generativeai")
+                    log.error(f"[Error] Failed to import google.generativeai: {e}")
+                    log.error("[Error] Please install: pip install google-generativeai")
                     self.client = None
                 except Exception as e:
-                    print(f"[Error] Failed to initialize Gemini client: {e}")
+                    log.error(f"[Error] Failed to initialize Gemini client: {e}")
                     self.client = None
 
     def execute_task(self, task: Task, context: str) -> str:
-        print(f"[GenAI] Starting task execution: {task.title} (ID: {task.id})")
-        print(f"[GenAI] Provider: {self.provider}, Model: {self.model}")
-        print(f"[GenAI] Service: {task.service_name}")
+        log.info(f"[GenAI] Starting task execution: {task.title} (ID: {task.id})")
+        log.info(f"[GenAI] Provider: {self.provider}, Model: {self.model}")
+        log.info(f"[GenAI] Service: {task.service_name}")
         
         if not self.client and self.provider != "gemini": # Gemini client is the model object
             error = self.error_handler.handle_error(
@@ -108,50 +513,69 @@ class GenAIOpenDevinClient(OpenDevinClient):
             return f"Error: {error.message}"
 
         prompt = self._construct_prompt(task, context)
-        print(f"[GenAI] Constructed prompt length: {len(prompt)} characters")
+        log.debug(f"[GenAI] Constructed prompt length: {len(prompt)} characters")
         
         try:
-            content = ""
+            # Files are written from inside the stream as each block completes; on a cache
+            # hit no stream runs and the cached content is parsed in one go instead.
+            streamed: List[_CodeBlockStreamParser] = []
             if self.provider == "gemini":
-                print(f"[GenAI] Calling Gemini API...")
-                response = self.client.generate_content(prompt)
-                content = response.text
+                def call():
+                    log.info("[GenAI] Calling Gemini API...")
+                    parser = _CodeBlockStreamParser(self._write_file)
+                    streamed.append(parser)
+                    response = self.client.generate_content(prompt, stream=True)
+                    return self._consume_stream((chunk.text for chunk in response), parser)
+                content = self._cached_completion(_SYSTEM_EXECUTE, prompt, call)
             else:
                 # OpenAI compatible (OpenAI, Ollama, Grok)
-                print(f"[GenAI] Calling {self.provider} API with model {self.model}...")
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are OpenDevin, an autonomous AI software engineer. You write production-ready code. When you write code, output it in markdown code blocks. IMPORTANT: The first line of every code block MUST be a comment containing the filename, e.g. `## filename: src/main.py` or `# filename: Dockerfile`. You must write the full content of the file."},
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                content = response.choices[0].message.content
+                system_prompt = _SYSTEM_EXECUTE
+                def call():
+                    log.info(f"[GenAI] Calling {self.provider} API with model {self.model}...")
+                    parser = _CodeBlockStreamParser(self._write_file)
+                    streamed.append(parser)
+                    stream = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=_messages(system_prompt, prompt),
+                        stream=True
+                    )
+                    return self._consume_stream(
+                        (chunk.choices[0].delta.content for chunk in stream if chunk.choices), parser
+                    )
+                content = self._cached_completion(system_prompt, prompt, call)
                 
-            print(f"[GenAI] Received response length: {len(content)} characters")
-            self._parse_and_write_files(content)
-            # Optional self-review pass
+            log.info(f"[GenAI] Received response length: {len(content)} characters")
+            if not streamed:
+                self._parse_and_write_files(content)
+            # Optional self-review pass, only when the response fails the cheap local checks
             try:
-                review_feedback = self._self_review(content, task)
-                if review_feedback and "```" in review_feedback:
-                    print("[GenAI] Applying self-review fixes")
-                    self._parse_and_write_files(review_feedback)
+                if self._quick_lint(content, task):
+                    review_feedback = self._self_review(content, task)
+                    if review_feedback and "```" in review_feedback:
+                        log.info("[GenAI] Applying self-review fixes")
+                        self._parse_and_write_files(review_feedback)
             except Exception:
-                pass
+                # The primary response is already written; a failed review shouldn't fail the task
+                log.exception("[GenAI] Self-review failed")
             return content
         except Exception as e:
             error = self.error_handler.handle_error(
                 e, {"provider": self.provider, "model": self.model, "task_id": task.id, "service_name": task.service_name, "phase": "execute_task"}
             )
-            print(f"[GenAI] Error calling LLM: {error.message}")
+            log.error(f"[GenAI] Error calling LLM: {error.message}")
             # Try alternate providers for consensus/fallback
             alt_content = self._try_alternate_providers(self._construct_prompt(task, context))
             if alt_content:
-                print("[GenAI] Fallback provider succeeded; applying content")
+                log.info("[GenAI] Fallback provider succeeded; applying content")
                 self._parse_and_write_files(alt_content)
                 return alt_content
             return f"Error calling LLM: {error.message}"
 
+    async def execute_task_async(self, task: Task, context: str) -> str:
+        """execute_task for async callers; the blocking call runs on the shared LLM worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_llm_executor(), self.execute_task, task, context)
+
     def fix_issues(self, task: Task, errors: str) -> str:
         if not self.client and self.provider != "gemini":
             error = self.error_handler.handle_error(
@@ -180,17 +604,18 @@ class GenAIOpenDevinClient(OpenDevinClient):
                  # Gemini doesn't have system prompts in the same way in generate_content, 
                  # so we prepend instructions
                  full_prompt = "You are OpenDevin. Fix the bugs based on the error logs provided. Output full file contents.\n" + prompt
-                 response = self.client.generate_content(full_prompt)
-                 content = response.text
+                 content = self._cached_completion(
+                     _SYSTEM_EXECUTE, full_prompt, lambda: self.client.generate_content(full_prompt).text
+                 )
             else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are OpenDevin. Fix the bugs based on the error logs provided. Output full file contents. IMPORTANT: The first line of every code block MUST be a comment containing the filename, e.g. `## filename: src/main.py`."},
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-                content = response.choices[0].message.content
+                system_prompt = _SYSTEM_FIX
+                def call():
+                    response = self.client.chat.completions.create(
+                        model=self.model,
+                        messages=_messages(system_prompt, prompt)
+                    )
+                    return response.choices[0].message.content
+                content = self._cached_completion(system_prompt, prompt, call)
                 
             self._parse_and_write_files(content)
             return content
@@ -200,7 +625,102 @@ class GenAIOpenDevinClient(OpenDevinClient):
             )
             return f"Error calling LLM: {error.message}"
 
+    def _cached_completion(self, system: str, user: str, call: Callable[[], str]) -> str:
+        """
+        Return a cached completion for these exact messages, or run call() and cache its result.
+        Concurrent calls with the same messages share a single call().
+        """
+        key = LLMCache.make_key(self.provider, self.model, system, user)
+        if self.llm_cache is None:
+            return self._coalesce(key, lambda: self._call_provider(call))
+        cached = self.llm_cache.get(key)
+        if cached is not None:
+            log.info(f"[GenAI] LLM cache hit for key: {key[:8]}...")
+            return cached
+
+        def call_and_store() -> str:
+            content = self._call_provider(call)
+            if content:
+                self.llm_cache.set(key, content)
+            return content
+        return self._coalesce(key, call_and_store)
+
+    def _coalesce(self, key: str, fn: Callable[[], str]) -> str:
+        """Run fn once per key; concurrent callers with the same key wait for and share its result."""
+        with self._INFLIGHT_LOCK:
+            future = self._INFLIGHT.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._INFLIGHT[key] = future
+
+        if not is_leader:
+            log.info(f"[GenAI] Joining in-flight request for key: {key[:8]}...")
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._INFLIGHT_LOCK:
+                self._INFLIGHT.pop(key, None)
+
+    def _call_provider(self, call: Callable[[], str], provider: Optional[str] = None) -> str:
+        """Run a provider call through the circuit breaker, recording its outcome."""
+        provider = provider or self.provider
+        if not self._circuit.allow(provider):
+            raise CircuitOpenError(f"Circuit breaker open for provider {provider}; skipping call")
+        try:
+            result = call()
+        except Exception as e:
+            if _is_provider_failure(e):
+                self._circuit.record_failure(provider)
+            raise
+        self._circuit.record_success(provider)
+        return result
+
+    def _quick_lint(self, content: str, task: Task) -> bool:
+        """
+        Cheap local check of a response; returns True when it looks incomplete enough
+        to be worth a self-review round-trip.
+        """
+        scan = _CodeBlockStreamParser(lambda filename, code: None, verbose=False)
+        scan.feed(content)
+        scan.close()
+        problems = []
+        if not scan.written:
+            problems.append("no files written")
+        if scan.unnamed_blocks:
+            problems.append(f"{scan.unnamed_blocks} code block(s) without a filename")
+        if "Scaffold" in task.title:
+            dockerfile = f"Dockerfile.{task.service_name}"
+            if not any(os.path.basename(name) == dockerfile for name in scan.written):
+                problems.append(f"missing {dockerfile}")
+        if problems:
+            log.info(f"[GenAI] Self-review needed: {', '.join(problems)}")
+            return True
+        log.info("[GenAI] Response passed quick checks; skipping self-review")
+        return False
+
     def _construct_prompt(self, task: Task, context: str) -> str:
+        # Budget the context against the model window so oversized prompts don't come back as 400s
+        window = _context_window(self.model)
+        if window is None:
+            return self._build_prompt(task, context)
+        template = self._build_prompt(task, "")
+        reserved = min(MAX_OUTPUT_TOKENS, window // 4)
+        budget = max(window - _count_tokens(_SYSTEM_EXECUTE) - _count_tokens(template) - reserved,
+                     MIN_CONTEXT_TOKENS)
+        truncated = _truncate_middle(context, budget)
+        if truncated is not context:
+            log.info(f"[GenAI] Context truncated to ~{budget} tokens to fit {self.model}'s {window}-token window")
+        return self._build_prompt(task, truncated)
+
+    def _build_prompt(self, task: Task, context: str) -> str:
         base_prompt = f"""
         Task: {task.title}
         Description: {task.description}
@@ -240,136 +760,131 @@ class GenAIOpenDevinClient(OpenDevinClient):
 
     def _self_review(self, content: str, task: Task) -> Optional[str]:
         """Ask the model to self-review generated code and propose corrections."""
-        try:
-            review_prompt = (
-                "You are OpenDevin. Review the generated code for the task '"
-                + task.title +
-                "'. Identify issues that would cause build/test failures (especially missing Dockerfiles or incorrect dependencies). "
-                "Provide corrected files in full, using markdown code blocks with filenames."
+        review_prompt = (
+            "You are OpenDevin. Review the generated code for the task '"
+            + task.title +
+            "'. Identify issues that would cause build/test failures (especially missing Dockerfiles or incorrect dependencies). "
+            "Provide corrected files in full, using markdown code blocks with filenames."
+        )
+        for attempt in range(SELF_REVIEW_ATTEMPTS):
+            try:
+                return self._request_review(review_prompt)
+            except (APIConnectionError, CircuitOpenError) as e:
+                # Already counted against the provider's circuit by _call_provider
+                log.warning(f"[GenAI] Self-review skipped, provider unavailable: {e}")
+                return None
+            except RateLimitError:
+                self._circuit.trip(self.provider, RATE_LIMIT_COOLDOWN)
+                log.warning(f"[GenAI] Self-review skipped, {self.provider} is rate limiting")
+                return None
+            except APIStatusError as e:
+                if e.status_code < 500:
+                    raise
+                log.warning(f"[GenAI] Self-review got HTTP {e.status_code} (attempt {attempt + 1}/{SELF_REVIEW_ATTEMPTS})")
+        return None
+
+    def _request_review(self, review_prompt: str) -> str:
+        if self.provider == "gemini":
+            return self._cached_completion(
+                _SYSTEM_EXECUTE, review_prompt,
+                lambda: getattr(self.client.generate_content(review_prompt), "text", "")
             )
-            if self.provider == "gemini":
-                response = self.client.generate_content(review_prompt)
-                return getattr(response, "text", "")
-            else:
-                resp = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are OpenDevin performing a self-review."},
-                        {"role": "user", "content": review_prompt}
-                    ]
-                )
-                return resp.choices[0].message.content
-        except Exception:
-            return None
+        system_prompt = _SYSTEM_REVIEW
+        def call():
+            resp = self.client.chat.completions.create(
+                model=self.model,
+                messages=_messages(system_prompt, review_prompt)
+            )
+            return resp.choices[0].message.content
+        return self._cached_completion(system_prompt, review_prompt, call)
 
     def _try_alternate_providers(self, prompt: str) -> Optional[str]:
         """Attempt to use alternate providers to get a valid response."""
         try:
-            alternates = [p for p in ["openai", "ollama", "grok"] if p != self.provider]
-            for prov in alternates:
-                api_key = self.config_manager.get_api_key(prov)
-                client = None
-                model = {
-                    "openai": "gpt-4-turbo",
-                    "ollama": "llama3.1",
-                    "grok": "grok-beta"
-                }.get(prov, "gpt-4-turbo")
-                try:
-                    if prov == "openai" and api_key:
-                        client = OpenAI(api_key=api_key)
-                        resp = client.chat.completions.create(
-                            model=model,
-                            messages=[
-                                {"role": "system", "content": "You are OpenDevin, an autonomous AI software engineer. Output full files in code blocks with filenames."},
-                                {"role": "user", "content": prompt}
-                            ]
-                        )
-                        return resp.choices[0].message.content
-                    elif prov == "ollama":
-                        client = OpenAI(base_url="http://localhost:11434/v1", api_key="ollama")
-                        resp = client.chat.completions.create(
-                            model=model,
-                            messages=[
-                                {"role": "system", "content": "You are OpenDevin, an autonomous AI software engineer. Output full files in code blocks with filenames."},
-                                {"role": "user", "content": prompt}
-                            ]
-                        )
-                        return resp.choices[0].message.content
-                    elif prov == "grok" and api_key:
-                        client = OpenAI(base_url="https://api.x.ai/v1", api_key=api_key)
-                        resp = client.chat.completions.create(
-                            model=model,
-                            messages=[
-                                {"role": "system", "content": "You are OpenDevin, an autonomous AI software engineer. Output full files in code blocks with filenames."},
-                                {"role": "user", "content": prompt}
-                            ]
-                        )
-                        return resp.choices[0].message.content
-                except Exception:
-                    continue
-        except Exception:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._try_alternate_providers_async(prompt))
+        # asyncio.run can't nest inside this thread's running loop; race on a worker thread instead
+        return _get_llm_executor().submit(asyncio.run, self._try_alternate_providers_async(prompt)).result()
+
+    async def _try_alternate_providers_async(self, prompt: str) -> Optional[str]:
+        """
+        Race all configured alternate providers concurrently.
+        The first successful response wins and the remaining requests are cancelled.
+        """
+        candidates = []
+        for prov, spec in _PROVIDER_SPECS.items():
+            if prov == self.provider or self._circuit.is_open(prov):
+                continue
+            api_key = self.config_manager.get_api_key(prov) if spec["needs_key"] else "ollama"
+            if not api_key:
+                continue
+            candidates.append((prov, spec["base_url"], api_key, spec["model"]))
+        if not candidates:
             return None
+
+        messages = _messages(_SYSTEM_FALLBACK, prompt)
+
+        async def complete(http_client: httpx.AsyncClient, prov: str, base_url: Optional[str], api_key: str, model: str) -> str:
+            if not self._circuit.allow(prov):
+                raise CircuitOpenError(f"Circuit breaker open for provider {prov}")
+            client = AsyncOpenAI(base_url=base_url, api_key=api_key, http_client=http_client)
+            try:
+                resp = await asyncio.wait_for(
+                    client.chat.completions.create(model=model, messages=messages), ALTERNATE_PROVIDER_TIMEOUT
+                )
+            except RateLimitError:
+                self._circuit.trip(prov, RATE_LIMIT_COOLDOWN)
+                raise
+            except Exception as e:
+                if _is_provider_failure(e):
+                    self._circuit.record_failure(prov)
+                raise
+            self._circuit.record_success(prov)
+            return resp.choices[0].message.content
+
+        # Async connection pools are bound to their event loop, so each race gets its own client
+        async with httpx.AsyncClient(timeout=httpx.Timeout(ALTERNATE_PROVIDER_TIMEOUT, connect=10.0)) as http_client:
+            pending = {
+                asyncio.create_task(complete(http_client, prov, base_url, api_key, model))
+                for prov, base_url, api_key, model in candidates
+            }
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for finished in done:
+                        error = finished.exception()
+                        if error is None:
+                            if finished.result():
+                                return finished.result()
+                        elif not isinstance(error, (APIError, asyncio.TimeoutError, CircuitOpenError)):
+                            # Anything other than a provider failure is a bug; don't hide it behind the fallback
+                            raise error
+            finally:
+                for straggler in pending:
+                    straggler.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
         return None
 
     def _parse_and_write_files(self, content: str):
         """
         Parses markdown code blocks and writes them to files.
         """
-        import re
-        print(f"[GenAI] Parsing content for code blocks...")
-        print(f"[GenAI] Content preview: {content[:200]}...")
-        
-        # Regex to find code blocks: ```lang ... ```
-        # We capture the language (group 1) and the code (group 2)
-        block_pattern = r"```(\w*)\n(.*?)```"
-        
-        # We will iterate through matches and look at the text preceding the match
-        last_end = 0
-        blocks_found = 0
-        files_written = 0
-        
-        for match in re.finditer(block_pattern, content, re.DOTALL):
-            start, end = match.span()
-            code = match.group(2)
-            blocks_found += 1
-            
-            filename = None
-            
-            # Strategy 1: Check first line of code for "filename: <name>" pattern
-            lines = code.strip().split('\n')
-            if lines:
-                first_line = lines[0].strip()
-                print(f"[GenAI] First line of code block {blocks_found}: {first_line}")
-                # Regex for comment with filename
-                # Supports #, //, --, or just text
-                # Looks for "filename: <name>"
-                name_match = re.search(r"filename:\s*([a-zA-Z0-9_./-]+)", first_line, re.IGNORECASE)
-                if name_match:
-                    filename = name_match.group(1)
-                    print(f"[GenAI] Found filename in first line: {filename}")
-                    # Remove the comment line from the code to keep it clean (optional, but good for Dockerfiles)
-                    # code = "\n".join(lines[1:]) 
-            
-            # Strategy 2: Look at the text before this block (Fallback)
-            if not filename:
-                preceding_text = content[last_end:start]
-                lines = preceding_text.strip().split('\n')
-                if lines:
-                    last_line = lines[-1].strip()
-                    file_match = re.search(r"([a-zA-Z0-9_./-]+\.[a-zA-Z0-9]+|Dockerfile(?:\.[a-zA-Z0-9_-]+)?)", last_line)
-                    if file_match:
-                        filename = file_match.group(1)
-                        print(f"[GenAI] Found filename in preceding text: {filename}")
-            
-            if filename:
-                self._write_file(filename.strip(), code.strip())
-                files_written += 1
-            else:
-                print(f"[GenAI] Warning: Could not determine filename for code block {blocks_found}")
-                
-            last_end = end
-        
-        print(f"[GenAI] Found {blocks_found} code blocks, wrote {files_written} files")
+        log.debug("[GenAI] Parsing content for code blocks...")
+        log.debug(f"[GenAI] Content preview: {content[:200]}...")
+        parser = _CodeBlockStreamParser(self._write_file)
+        parser.feed(content)
+        parser.close()
+
+    def _consume_stream(self, pieces: Iterable[Optional[str]], parser: "_CodeBlockStreamParser") -> str:
+        """Feed streamed text pieces to parser as they arrive and return the full response."""
+        parts = []
+        for piece in pieces:
+            if piece:
+                parts.append(piece)
+                parser.feed(piece)
+        parser.close()
+        return "".join(parts)
 
     def _write_file(self, filename: str, content: str):
         try:
@@ -378,14 +893,38 @@ class GenAIOpenDevinClient(OpenDevinClient):
             if not os.path.isabs(target_path):
                 target_path = os.path.join(self.project_root, target_path)
             directory = os.path.dirname(target_path)
-            if directory:
+            if directory and directory not in self._created_dirs:
                 os.makedirs(directory, exist_ok=True)
-                print(f"[GenAI] Created directory: {directory}")
-            
-            with open(target_path, "w", encoding='utf-8') as f:
+                self._created_dirs.add(directory)
+                log.debug(f"[GenAI] Created directory: {directory}")
+
+            # Self-review often re-emits files unchanged; skip the rewrite when the file on disk
+            # is still exactly what we last wrote there
+            digest = hashlib.sha1(content.encode("utf-8")).hexdigest()
+            previous = self._written.get(target_path)
+            if previous is not None and previous[0] == digest:
+                try:
+                    st = os.stat(target_path)
+                    if (st.st_mtime_ns, st.st_size) == previous[1:]:
+                        self._written.move_to_end(target_path)
+                        log.debug(f"[GenAI] Unchanged, skipping write: {target_path}")
+                        return
+                except OSError:
+                    pass
+
+            try:
+                f = open(target_path, "w", encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+            except FileNotFoundError:
+                # A long-lived client can outlive a directory it created earlier
+                os.makedirs(directory, exist_ok=True)
+                f = open(target_path, "w", encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+            with f:
                 f.write(content)
-            print(f"[GenAI] Successfully wrote file: {target_path} ({len(content)} characters)")
+            st = os.stat(target_path)
+            self._written[target_path] = (digest, st.st_mtime_ns, st.st_size)
+            self._written.move_to_end(target_path)
+            while len(self._written) > WRITTEN_FILES_LIMIT:
+                self._written.popitem(last=False)
+            log.info(f"[GenAI] Successfully wrote file: {target_path} ({len(content)} characters)")
         except Exception as e:
-            print(f"[GenAI] Failed to write {filename}: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception(f"[GenAI] Failed to write {filename}: {e}")
@@ -0,0 +1,137 @@
+"""
+Exact-match response cache for deterministic LLM calls.
+"""
+
+import os
+import time
+import logging
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Protocol, Tuple
+from auto_dev_supervisor.infra.jsonutil import dumps, loads
+
+log = logging.getLogger("auto_dev_supervisor.llm")
+
+# Opt-in switch: only flows that tolerate reusing an earlier completion should enable it
+CACHE_ENV_VAR = "AUTO_DEV_LLM_CACHE"
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".auto-dev", "cache", "llm")
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        ...
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class DiskCacheBackend:
+    """One JSON blob per key under a cache directory; survives restarts."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = loads(f.read())
+        except (OSError, ValueError):
+            return None
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        entry = {"value": value, "expires_at": time.time() + ttl if ttl else None}
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(dumps(entry))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log.warning(f"[LLMCache] Failed to write cache entry: {e}")
+
+
+class LLMCache:
+    """
+    Tiered cache for LLM completions keyed by provider, model and the exact messages.
+    Backends are checked in order; a hit in a later backend is copied into the earlier ones.
+    """
+
+    def __init__(self, backends: List[CacheBackend], ttl: Optional[float] = DEFAULT_TTL_SECONDS):
+        self.backends = backends
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(provider: str, model: str, system: str, user: str) -> str:
+        payload = dumps(
+            {"provider": provider, "model": model, "system": system, "user": user},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMCache"]:
+        """Build the default memory + disk cache when AUTO_DEV_LLM_CACHE=1, else None."""
+        if os.getenv(CACHE_ENV_VAR) != "1":
+            return None
+        try:
+            return cls([MemoryCacheBackend(), DiskCacheBackend()])
+        except OSError as e:
+            log.warning(f"[LLMCache] Disk cache unavailable, using memory only: {e}")
+            return cls([MemoryCacheBackend()])
+
+    def get(self, key: str) -> Optional[str]:
+        for i, backend in enumerate(self.backends):
+            value = backend.get(key)
+            if value is not None:
+                for earlier in self.backends[:i]:
+                    earlier.set(key, value, ttl=self.ttl)
+                return value
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        for backend in self.backends:
+            backend.set(key, value, ttl=self.ttl)
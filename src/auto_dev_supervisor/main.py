@@ -1,23 +1,152 @@
 import typer
 import os
-from auto_dev_supervisor.core.planner import Planner
-from auto_dev_supervisor.core.supervisor import Supervisor
-from auto_dev_supervisor.core.enhanced_supervisor import EnhancedSupervisor
-from auto_dev_supervisor.infra.opendevin import MockOpenDevinClient
-from auto_dev_supervisor.infra.llm import GenAIOpenDevinClient
-from auto_dev_supervisor.infra.enhanced_llm import EnhancedGenAIOpenDevinClient
-from auto_dev_supervisor.infra.docker import DockerManager
-from auto_dev_supervisor.infra.git import GitManager
-from auto_dev_supervisor.domain.qa import QAManager
-from auto_dev_supervisor.gui.app import main as gui_main
-
-app = typer.Typer()
+import functools
+import pathlib
+from typing import Any, Callable, Dict, Final, Optional
+
+# Heavy dependencies (docker, git, openai, the GUI toolkit) are imported inside the commands
+# that need them, so `--help` and argument errors don't pay for loading them.
+
+# Default model for each real LLM provider
+_DEFAULT_MODELS: Final[Dict[str, str]] = {
+    "openai": "gpt-4-turbo",
+    "ollama": "llama3.1",
+    "gemini": "gemini-1.5-flash",
+    "grok": "grok-beta"
+}
+
+def _make_enhanced_client(provider: str, model: str, project_root: str, **options):
+    return _cached_enhanced_client(provider, model or _DEFAULT_MODELS[provider], project_root, **options)
+
+@functools.lru_cache(maxsize=8)
+def _cached_enhanced_client(provider: str, model: str, project_root: str, **options):
+    # Repeated run() calls in one process (tests, embedding) with the same settings share a
+    # client, and with it the HTTP connection pool and response cache
+    from auto_dev_supervisor.infra.enhanced_llm import EnhancedGenAIOpenDevinClient
+    # Use enhanced LLM client for better performance
+    return EnhancedGenAIOpenDevinClient(
+        provider=provider,
+        model=model,
+        project_root=project_root,
+        **options
+    )
+
+def _make_mock_client(provider: str, model: str, project_root: str, **options):
+    from auto_dev_supervisor.infra.opendevin import MockOpenDevinClient
+    return MockOpenDevinClient()
+
+# Each factory imports its own client, so only the chosen provider's dependencies get loaded.
+# Any --llm-provider value not listed here uses the mock client.
+_LLM_FACTORIES: Final[Dict[str, Callable[..., Any]]] = {
+    "mock": _make_mock_client,
+    **{provider: _make_enhanced_client for provider in _DEFAULT_MODELS}
+}
+
+app = typer.Typer(add_completion=False, rich_markup_mode=None, pretty_exceptions_enable=False)
+
+# Tuning knobs read from --perf-config; keys the file leaves out keep these defaults
+_PERF_DEFAULTS: Final[Dict[str, Any]] = {
+    "enable_cache": True,  # Response caching
+    "enable_streaming": True,  # Streaming responses for faster perceived performance
+    "use_enhanced_supervisor": True,  # Iterative error resolution
+    "enable_advanced_recovery": True,
+    "max_parallel_requests": 3,  # Parallel LLM requests
+    # Independent tasks run concurrently above 1; they share one working tree, so commits
+    # may include files from tasks still in flight
+    "max_parallel_tasks": 1
+}
+
+def _load_perf_config(path: Optional[str]) -> Dict[str, Any]:
+    """Merge a JSON (or, by .toml extension, TOML) tuning file over _PERF_DEFAULTS."""
+    config = dict(_PERF_DEFAULTS)
+    if not path:
+        return config
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        if path.endswith(".toml"):
+            try:
+                import tomllib
+            except ImportError:
+                raise typer.BadParameter("TOML files need Python 3.11+; use a JSON file instead", param_hint="--perf-config")
+            data = tomllib.loads(raw.decode("utf-8"))
+        else:
+            from auto_dev_supervisor.infra.jsonutil import loads
+            data = loads(raw)
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(f"Cannot read {path}: {e}", param_hint="--perf-config")
+    if not isinstance(data, dict):
+        raise typer.BadParameter(f"{path} must contain a table of settings", param_hint="--perf-config")
+    for key, value in data.items():
+        if key not in config:
+            raise typer.BadParameter(f"Unknown setting '{key}' (expected one of: {', '.join(config)})", param_hint="--perf-config")
+        # bool is an int subclass, so compare exact types
+        if type(value) is not type(config[key]):
+            raise typer.BadParameter(f"'{key}' must be of type {type(config[key]).__name__}", param_hint="--perf-config")
+        # The integer settings are all worker counts
+        if type(value) is int and value < 1:
+            raise typer.BadParameter(f"'{key}' must be at least 1", param_hint="--perf-config")
+        config[key] = value
+    return config
+
+@functools.cache
+def _init_llm_log_handler():
+    """Print LLM client log lines as plain messages on stdout, like the rest of the CLI output."""
+    import logging
+    import sys
+
+    class _StdoutHandler(logging.StreamHandler):
+        """StreamHandler that writes to whatever sys.stdout is at emit time (the GUI swaps it for its log widget)."""
+
+        @property
+        def stream(self):
+            return sys.stdout
+
+        @stream.setter
+        def stream(self, value):
+            pass
+
+    handler = _StdoutHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    llm_log = logging.getLogger("auto_dev_supervisor.llm")
+    llm_log.addHandler(handler)
+    llm_log.propagate = False
+
+@functools.cache
+def _init_logging(verbose: bool):
+    """Configure logging once per process, after arguments have been validated."""
+    import logging
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    _init_llm_log_handler()
+    logging.getLogger("auto_dev_supervisor.llm").setLevel(logging.DEBUG if verbose else logging.INFO)
+
+def _abs(path: str) -> str:
+    # Canonicalize once per run (symlinks included); the managers use the string as given.
+    # Not cached: a relative path depends on the current directory, which embedders may change.
+    return os.fspath(pathlib.Path(path).resolve())
+
+def _prewarm_imports(*modules: str):
+    """Import modules on a daemon thread so they are loaded by the time the main thread needs them."""
+    import importlib
+    import threading
+
+    def _load():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                # The main thread's own import of the module reports the error
+                pass
+
+    threading.Thread(target=_load, name="prewarm-imports", daemon=True).start()
 
 @app.command()
 def gui():
     """
     Launch the Auto-Dev Supervisor GUI.
     """
+    _init_logging(False)
+    from auto_dev_supervisor.gui.app import main as gui_main
     gui_main()
 
 @app.command()
@@ -29,60 +158,84 @@ def run(
     llm_provider: str = typer.Option("openai", "--llm-provider", help="LLM provider to use: 'mock', 'openai', 'ollama', 'gemini', 'grok'"),
     model: str = typer.Option(None, "--model", help="Specific model to use (e.g., 'gpt-4-turbo', 'gemini-1.5-flash', 'llama3.1', 'mixtral')"),
     skip_docker: bool = typer.Option(False, "--skip-docker", help="Run without Docker build/test"),
-    enable_cache: bool = typer.Option(True, "--enable-cache", help="Enable response caching for faster performance"),
-    enable_streaming: bool = typer.Option(True, "--enable-streaming", help="Enable streaming responses for faster perceived performance"),
-    use_enhanced_supervisor: bool = typer.Option(True, "--use-enhanced-supervisor", help="Use enhanced supervisor with iterative error resolution"),
-    enable_advanced_recovery: bool = typer.Option(True, "--enable-advanced-recovery", help="Enable advanced recovery strategies"),
-    max_parallel_requests: int = typer.Option(3, "--max-parallel-requests", help="Maximum parallel LLM requests for faster processing"),
+    perf_config: str = typer.Option(None, "--perf-config", help="JSON or TOML file with tuning settings: enable_cache, enable_streaming, use_enhanced_supervisor, enable_advanced_recovery, max_parallel_requests, max_parallel_tasks"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose logging")
 ):
     """
     Run the Autonomous Developer Supervisor.
     """
-    import logging
-    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-    
-    abs_project_root = os.path.abspath(project_root)
+    perf = _load_perf_config(perf_config)
+    use_enhanced_supervisor = perf["use_enhanced_supervisor"]
+    max_parallel_requests = perf["max_parallel_requests"]
+    max_parallel_tasks = perf["max_parallel_tasks"]
+    _init_logging(verbose)
+
+    # The heaviest modules (openai/httpx, docker, rich-based supervisors) load in the background
+    # while the planner, git and the spec are handled here
+    prewarm = [
+        "auto_dev_supervisor.infra.enhanced_llm" if llm_provider in _DEFAULT_MODELS else "auto_dev_supervisor.infra.opendevin",
+        "auto_dev_supervisor.core.enhanced_supervisor" if use_enhanced_supervisor else "auto_dev_supervisor.core.supervisor"
+    ]
+    if not skip_docker:
+        prewarm.append("auto_dev_supervisor.infra.docker")
+    _prewarm_imports(*prewarm)
+
+    from concurrent.futures import ThreadPoolExecutor
+    from auto_dev_supervisor.core.planner import Planner
+    from auto_dev_supervisor.infra.git import GitManager
+    from auto_dev_supervisor.domain.qa import QAManager
+
+    abs_project_root = _abs(project_root)
     
     # Initialize components
     planner = Planner()
-    
-    opendevin = None
-    if llm_provider in ["openai", "ollama", "gemini", "grok"]:
-        # Set appropriate default models for each provider
-        default_models = {
-            "openai": "gpt-4-turbo",
-            "ollama": "llama3.1",
-            "gemini": "gemini-1.5-flash",
-            "grok": "grok-beta"
-        }
-        selected_model = model or default_models.get(llm_provider, "gpt-4-turbo")
-        # Use enhanced LLM client for better performance
-        opendevin = EnhancedGenAIOpenDevinClient(
-            provider=llm_provider, 
-            model=selected_model,
-            project_root=abs_project_root,
-            enable_cache=enable_cache,
-            enable_streaming=enable_streaming,
+
+    # GitManager needs the repo URL from the spec. Parse it on a worker thread while the
+    # LLM client and Docker client (which may wait on the network or the daemon socket) are set up.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        spec_future = pool.submit(planner.parse_spec, spec_path)
+
+        make_client = _LLM_FACTORIES.get(llm_provider, _make_mock_client)
+        opendevin = make_client(
+            llm_provider,
+            model,
+            abs_project_root,
+            enable_cache=perf["enable_cache"],
+            enable_streaming=perf["enable_streaming"],
             max_parallel_requests=max_parallel_requests
         )
-    else:
-        opendevin = MockOpenDevinClient()
-        
-    docker_manager = DockerManager(abs_project_root)
-    
-    # For GitManager, we need to parse the spec first to get the repo URL, 
-    # but the Supervisor does that. 
-    # So we'll initialize GitManager with placeholders and let it re-init if needed,
-    # or better, we pass the factory or just init it with the root and let it handle the rest.
-    # For simplicity, we'll assume the spec is available or we parse it quickly here to get the repo URL.
-    spec = planner.parse_spec(spec_path)
+
+        docker_manager = None
+        if not skip_docker:
+            # Creating the client probes the Docker daemon, so only do it when Docker is used
+            from auto_dev_supervisor.infra.docker import DockerManager
+            docker_manager = DockerManager(abs_project_root)
+
+        spec = spec_future.result()
+
     git_manager = GitManager(abs_project_root, spec.repository_url, spec.branch)
     
     qa_manager = QAManager()
     
     # Use enhanced supervisor for better error resolution and speed
-    if use_enhanced_supervisor:
+    if use_enhanced_supervisor and max_parallel_tasks > 1:
+        # Independent tasks (e.g. scaffolds of unrelated services) run concurrently
+        from auto_dev_supervisor.core.async_supervisor import AsyncEnhancedSupervisor
+        supervisor = AsyncEnhancedSupervisor(
+            planner=planner,
+            opendevin=opendevin,
+            docker_manager=docker_manager,
+            git_manager=git_manager,
+            qa_manager=qa_manager,
+            project_root=abs_project_root,
+            max_retries=max_retries,
+            skip_git=skip_git,
+            skip_docker=skip_docker,
+            enable_advanced_recovery=perf["enable_advanced_recovery"],
+            max_parallel=max_parallel_tasks
+        )
+    elif use_enhanced_supervisor:
+        from auto_dev_supervisor.core.enhanced_supervisor import EnhancedSupervisor
         supervisor = EnhancedSupervisor(
             planner=planner,
             opendevin=opendevin,
@@ -93,9 +246,10 @@ def run(
             max_retries=max_retries,
             skip_git=skip_git,
             skip_docker=skip_docker,
-            enable_advanced_recovery=enable_advanced_recovery
+            enable_advanced_recovery=perf["enable_advanced_recovery"]
         )
     else:
+        from auto_dev_supervisor.core.supervisor import Supervisor
         supervisor = Supervisor(
             planner=planner,
             opendevin=opendevin,
@@ -110,5 +264,39 @@ def run(
     
     supervisor.run(spec_path)
 
-if __name__ == "__main__":
+_HELP = """Usage: auto-dev [OPTIONS] COMMAND [ARGS]...
+
+  Autonomous Developer Supervisor.
+
+Options:
+  -V, --version  Show the version and exit.
+  -h, --help     Show this message and exit.
+
+Commands:
+  gui  Launch the Auto-Dev Supervisor GUI.
+  run  Run the Autonomous Developer Supervisor.
+
+Run `auto-dev COMMAND --help` for the options of a command.
+"""
+
+def _version() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version("auto-dev-supervisor")
+    except PackageNotFoundError:
+        return "unknown (not installed)"
+
+def main():
+    """CLI entry point; trivial invocations are answered without building the Typer app."""
+    import sys
+    args = sys.argv[1:]
+    if args in (["--version"], ["-V"]):
+        print(f"auto-dev-supervisor {_version()}")
+        sys.exit(0)
+    if not args or args in (["--help"], ["-h"]):
+        print(_HELP, end="")
+        sys.exit(0)
     app()
+
+if __name__ == "__main__":
+    main()
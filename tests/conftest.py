@@ -0,0 +1,22 @@
+import pytest
+from unittest.mock import MagicMock
+from auto_dev_supervisor.infra.docker import DockerManager
+from auto_dev_supervisor.infra.git import GitManager
+from auto_dev_supervisor.domain.model import TaskTestResult, TaskTestType
+
+@pytest.fixture(scope="session")
+def docker_mgr_factory():
+    """Returns a function building DockerManager mocks whose builds and tests succeed."""
+    passed = TaskTestResult(type=TaskTestType.UNIT, passed=True, details="Pass")
+
+    def make():
+        manager = MagicMock(spec=DockerManager)
+        manager.build_services.return_value = True
+        manager.run_tests.return_value = passed
+        return manager
+    return make
+
+@pytest.fixture(scope="session")
+def git_mgr_factory():
+    """Returns a function building GitManager mocks."""
+    return lambda: MagicMock(spec=GitManager)
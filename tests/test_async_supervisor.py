@@ -0,0 +1,70 @@
+import threading
+from unittest.mock import MagicMock
+from auto_dev_supervisor.core.async_supervisor import AsyncEnhancedSupervisor
+from auto_dev_supervisor.core.planner import Planner
+from auto_dev_supervisor.infra.opendevin import MockOpenDevinClient
+from auto_dev_supervisor.infra.docker import DockerManager
+from auto_dev_supervisor.infra.git import GitManager
+from auto_dev_supervisor.domain.qa import QAManager
+from auto_dev_supervisor.domain.model import Task, TaskStatus
+
+def _supervisor(tmp_path, max_parallel):
+    return AsyncEnhancedSupervisor(
+        planner=MagicMock(spec=Planner),
+        opendevin=MockOpenDevinClient(),
+        docker_manager=MagicMock(spec=DockerManager),
+        git_manager=MagicMock(spec=GitManager),
+        qa_manager=QAManager(),
+        project_root=str(tmp_path),
+        skip_git=True,
+        skip_docker=True,
+        max_parallel=max_parallel
+    )
+
+def test_independent_tasks_run_concurrently_and_dependencies_wait(tmp_path):
+    supervisor = _supervisor(tmp_path, max_parallel=2)
+    tasks = [
+        Task(id="scaffold-a", title="Scaffold a", description="", service_name="a"),
+        Task(id="scaffold-b", title="Scaffold b", description="", service_name="b"),
+        Task(id="implement-a", title="Implement a", description="", service_name="a", dependencies=["scaffold-a"]),
+    ]
+    # Both scaffolds must be in flight at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    order = []
+
+    def process(task, spec, progress, iteration):
+        if task.id.startswith("scaffold-"):
+            barrier.wait()
+        order.append(task.id)
+        task.status = TaskStatus.COMPLETED
+
+    supervisor._process_task_with_enhanced_recovery = process
+    supervisor._run_enhanced_main_loop(tasks, MagicMock())
+
+    assert all(t.status == TaskStatus.COMPLETED for t in tasks)
+    assert order[-1] == "implement-a"
+
+def test_docker_sections_are_serialized(tmp_path):
+    supervisor = _supervisor(tmp_path, max_parallel=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def build(service_name):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        threading.Event().wait(0.05)
+        with lock:
+            active[0] -= 1
+        return True
+
+    supervisor.docker_manager.build_services.side_effect = build
+    tasks = [Task(id=f"scaffold-{n}", title=n, description="", service_name=n) for n in "ab"]
+    threads = [threading.Thread(target=supervisor._build_and_start_services, args=(t,)) for t in tasks]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert supervisor.docker_manager.build_services.call_count == 2
+    assert peak[0] == 1
@@ -1,13 +1,20 @@
 import pytest
+from types import SimpleNamespace as NS
 from unittest.mock import MagicMock, patch
 from auto_dev_supervisor.infra.docker import DockerManager
 from auto_dev_supervisor.domain.model import ProjectSpec, ServiceSpec, AppType, TaskTestType
 
-@pytest.fixture
-def mock_docker_client():
-    with patch("docker.from_env") as mock:
+@pytest.fixture(scope="module")
+def _docker_from_env():
+    # Patched once per module; autospec keeps calls checked against from_env's signature
+    with patch("docker.from_env", autospec=True) as mock:
         yield mock
 
+@pytest.fixture
+def mock_docker_client(_docker_from_env):
+    _docker_from_env.mock.reset_mock(return_value=True, side_effect=True)
+    return _docker_from_env
+
 def test_generate_compose_file(tmp_path):
     manager = DockerManager(str(tmp_path))
     spec = ProjectSpec(
@@ -33,7 +40,7 @@ def test_run_tests_success(mock_docker_client):
     
     # Mock container execution
     mock_container = MagicMock()
-    mock_container.exec_run.return_value = MagicMock(exit_code=0, output=b"Tests passed")
+    mock_container.exec_run.return_value = NS(exit_code=0, output=b"Tests passed")
     mock_docker_client.return_value.containers.get.return_value = mock_container
     
     result = manager.run_tests("api", TaskTestType.UNIT)
@@ -46,7 +53,7 @@ def test_run_tests_failure(mock_docker_client):
     manager = DockerManager("/tmp/project")
     
     mock_container = MagicMock()
-    mock_container.exec_run.return_value = MagicMock(exit_code=1, output=b"Tests failed")
+    mock_container.exec_run.return_value = NS(exit_code=1, output=b"Tests failed")
     mock_docker_client.return_value.containers.get.return_value = mock_container
     
     result = manager.run_tests("api", TaskTestType.UNIT)
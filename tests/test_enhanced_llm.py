@@ -0,0 +1,123 @@
+import pytest
+import httpx
+from types import SimpleNamespace as NS
+from openai import RateLimitError
+from unittest.mock import MagicMock, patch
+from auto_dev_supervisor.infra import enhanced_llm
+from auto_dev_supervisor.infra.enhanced_llm import EnhancedGenAIOpenDevinClient, MAX_RETRY_DELAY
+from auto_dev_supervisor.infra.jsonutil import dumps
+from auto_dev_supervisor.infra.llm import ProviderCircuitBreaker
+from auto_dev_supervisor.domain.model import Task
+
+@pytest.fixture
+def make_client(tmp_path, monkeypatch):
+    # Keeps ~/.auto-dev/cache inside the test's temp dir
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    config_manager = MagicMock()
+    config_manager.get_api_key.return_value = "fake-key"
+
+    def make(**kwargs):
+        client = EnhancedGenAIOpenDevinClient(
+            provider="openai", model="gpt-4-turbo", config_manager=config_manager,
+            project_root=str(tmp_path / "project"), **kwargs
+        )
+        client._circuit = ProviderCircuitBreaker()
+        return client
+    return make
+
+def _rate_limit_error(retry_after=None):
+    headers = {"retry-after": retry_after} if retry_after else {}
+    response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "http://llm.test/v1/chat/completions"))
+    return RateLimitError("rate limited", response=response, body=None)
+
+def test_transient_errors_are_retried_with_capped_delay(make_client):
+    client = make_client(enable_cache=False)
+    task = Task(id="t1", title="Test Task", description="Desc", service_name="svc")
+    with patch.object(client, "_execute_with_streaming", side_effect=[_rate_limit_error("600"), "done"]) as call, \
+         patch("auto_dev_supervisor.infra.enhanced_llm.time.sleep") as sleep:
+        assert client._execute_with_retries(task, "prompt", "key") == "done"
+    assert call.call_count == 2
+    sleep.assert_called_once_with(MAX_RETRY_DELAY)
+
+def test_retries_give_up_after_max_attempts(make_client):
+    client = make_client(enable_cache=False)
+    task = Task(id="t1", title="Test Task", description="Desc", service_name="svc")
+    with patch.object(client, "_execute_with_streaming", side_effect=_rate_limit_error()) as call, \
+         patch("auto_dev_supervisor.infra.enhanced_llm.time.sleep"):
+        with pytest.raises(RateLimitError):
+            client._execute_with_retries(task, "prompt", "key")
+    assert call.call_count == enhanced_llm.MAX_PROVIDER_ATTEMPTS
+
+def test_provider_calls_disable_sdk_retries(make_client, tmp_path):
+    client = make_client(enable_cache=False, enable_streaming=False)
+    client.client = MagicMock()
+    no_retry = client.client.with_options.return_value
+    no_retry.chat.completions.create.return_value = NS(choices=[NS(message=NS(content="no code"))])
+    task = Task(id="t1", title="Test Task", description="Desc", service_name="svc")
+
+    assert client._execute_openai_streaming(task, "prompt") == "no code"
+    client.client.with_options.assert_called_once_with(max_retries=0)
+    client.client.chat.completions.create.assert_not_called()
+
+def test_cached_responses_round_trip(make_client):
+    client = make_client()
+    large = "x = 1\n" * 500
+    client._cache_response("big", large)
+    client._cache_response("small", "ok")
+    client._save_cache()
+
+    reloaded = make_client()
+    assert reloaded._get_cached_response("big") == large
+    assert reloaded._get_cached_response("small") == "ok"
+
+def test_large_responses_are_zstd_compressed(make_client):
+    pytest.importorskip("zstandard")
+    client = make_client()
+    large = "x = 1\n" * 500
+    stored = client._compress(large)
+    assert stored.startswith(enhanced_llm.ZSTD_PREFIX) and len(stored) < len(large)
+    assert client._decompress(stored) == large
+
+def test_self_review_cache_is_bounded_lru(make_client):
+    client = make_client()
+    client.client = MagicMock()
+    client.client.chat.completions.create.return_value = NS(choices=[NS(message=NS(content="CODE_OK"))])
+    task = Task(id="t1", title="Test Task", description="Desc", service_name="svc")
+
+    with patch.object(enhanced_llm, "REVIEW_CACHE_LIMIT", 2):
+        client._enhanced_self_review("a", task, "ctx", prompt_hash="p")
+        client._enhanced_self_review("b", task, "ctx", prompt_hash="p")
+        client._enhanced_self_review("a", task, "ctx", prompt_hash="p")  # hit; "b" is now oldest
+        client._enhanced_self_review("c", task, "ctx", prompt_hash="p")  # evicts "b"
+        assert client.client.chat.completions.create.call_count == 3
+        client._enhanced_self_review("a", task, "ctx", prompt_hash="p")
+        assert client.client.chat.completions.create.call_count == 3
+        client._enhanced_self_review("b", task, "ctx", prompt_hash="p")
+        assert client.client.chat.completions.create.call_count == 4
+
+def test_self_review_cache_is_off_when_caching_is_disabled(make_client):
+    client = make_client(enable_cache=False)
+    client.client = MagicMock()
+    client.client.chat.completions.create.return_value = NS(choices=[NS(message=NS(content="CODE_OK"))])
+    task = Task(id="t1", title="Test Task", description="Desc", service_name="svc")
+
+    client._enhanced_self_review("a", task, "ctx", prompt_hash="p")
+    client._enhanced_self_review("a", task, "ctx", prompt_hash="p")
+    assert client.client.chat.completions.create.call_count == 2
+    assert not client._review_cache
+
+def test_error_history_persists_and_compacts(make_client):
+    client = make_client()
+    client._record_error_context({"error": "first"})
+    assert [e["error"] for e in make_client().error_context_history] == ["first"]
+
+    limit = enhanced_llm.ERROR_HISTORY_LIMIT
+    with open(client.error_log_file, "w", encoding="utf-8") as f:
+        for i in range(limit * 10 + 1):
+            f.write(dumps({"error": str(i)}) + "\n")
+
+    reloaded = make_client()
+    assert len(reloaded.error_context_history) == limit
+    assert reloaded.error_context_history[-1]["error"] == str(limit * 10)
+    with open(client.error_log_file, encoding="utf-8") as f:
+        assert len(f.readlines()) == limit
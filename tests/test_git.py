@@ -3,14 +3,20 @@ from unittest.mock import MagicMock, patch
 from auto_dev_supervisor.infra.git import GitManager
 from auto_dev_supervisor.domain.model import Task, TaskTestResult, TaskTestType
 
-@pytest.fixture
-def mock_git_repo():
+@pytest.fixture(scope="module")
+def _git_repo_class():
+    # Not autospecced: Repo.git is an instance attribute, which autospec can't see
     with patch("git.Repo") as mock:
         yield mock
 
+@pytest.fixture
+def mock_git_repo(_git_repo_class):
+    _git_repo_class.reset_mock(return_value=True, side_effect=True)
+    return _git_repo_class
+
 def test_commit_changes_success(mock_git_repo):
     manager = GitManager("/tmp/project", "http://repo")
-    manager.repo.is_dirty.return_value = True
+    manager.repo.git.status.return_value = " M app.py\x00?? new.py\x00 D old.py\x00"
     
     task = Task(id="task-1", title="Test Task", description="desc", service_name="svc")
     results = [TaskTestResult(type=TaskTestType.UNIT, passed=True, details="pass")]
@@ -18,7 +24,9 @@ def test_commit_changes_success(mock_git_repo):
     success = manager.commit_changes(task, results)
     
     assert success
-    manager.repo.git.add.assert_called_with(A=True)
+    manager.repo.git.add.assert_not_called()
+    manager.repo.index.add.assert_called_with(["app.py", "new.py"])
+    manager.repo.index.remove.assert_called_with(["old.py"])
     manager.repo.index.commit.assert_called()
     
     # Check commit message content
@@ -26,13 +34,37 @@ def test_commit_changes_success(mock_git_repo):
     message = args[0]
     assert "feat: Complete task task-1" in message
     assert "Test summary:" in message
+    assert "app.py (modified)" in message
+    assert "new.py (added)" in message
+    assert "old.py (deleted)" in message
 
 def test_commit_changes_no_changes(mock_git_repo):
     manager = GitManager("/tmp/project", "http://repo")
-    manager.repo.is_dirty.return_value = False
+    manager.repo.git.status.return_value = ""
     
     task = Task(id="task-1", title="Test Task", description="desc", service_name="svc")
     success = manager.commit_changes(task, [])
     
     assert success
     manager.repo.index.commit.assert_not_called()
+
+def test_commit_changes_leaves_already_staged_entries(mock_git_repo):
+    manager = GitManager("/tmp/project", "http://repo")
+    manager.repo.git.status.return_value = "D  staged_rm.py\x00 D gone.py\x00M  staged.py\x00MM both.py\x00"
+    
+    task = Task(id="task-1", title="Test Task", description="desc", service_name="svc")
+    assert manager.commit_changes(task, [])
+    
+    # A deletion already in the index must not reach `git rm --cached` again
+    manager.repo.index.remove.assert_called_once_with(["gone.py"])
+    manager.repo.index.add.assert_called_once_with(["both.py"])
+    message = manager.repo.index.commit.call_args[0][0]
+    assert "staged_rm.py (deleted)" in message
+    assert "staged.py (modified)" in message
+
+def test_read_status_lists_untracked_files_individually(mock_git_repo):
+    manager = GitManager("/tmp/project", "http://repo")
+    manager.repo.git.status.return_value = "?? newdir/a.py\x00?? newdir/sub/b.py\x00"
+    
+    assert manager._read_status() == [("??", "newdir/a.py"), ("??", "newdir/sub/b.py")]
+    manager.repo.git.status.assert_called_with("--porcelain=v1", "-z", "--untracked-files=all")
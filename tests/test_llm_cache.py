@@ -0,0 +1,40 @@
+import pytest
+from unittest.mock import patch
+from auto_dev_supervisor.infra.llm_cache import LLMCache, MemoryCacheBackend, DiskCacheBackend
+
+def test_make_key_is_stable_and_message_sensitive():
+    key = LLMCache.make_key("openai", "gpt-4-turbo", "system", "prompt")
+    assert key == LLMCache.make_key("openai", "gpt-4-turbo", "system", "prompt")
+    assert key != LLMCache.make_key("openai", "gpt-4-turbo", "system", "other prompt")
+    assert key != LLMCache.make_key("ollama", "gpt-4-turbo", "system", "prompt")
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryCacheBackend(max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    assert backend.get("a") == "1"  # touch "a" so "b" becomes the oldest
+    backend.set("c", "3")
+
+    assert backend.get("a") == "1"
+    assert backend.get("b") is None
+    assert backend.get("c") == "3"
+
+def test_memory_backend_expires_entries():
+    backend = MemoryCacheBackend()
+    with patch("auto_dev_supervisor.infra.llm_cache.time.time", return_value=1000.0):
+        backend.set("a", "1", ttl=10)
+    with patch("auto_dev_supervisor.infra.llm_cache.time.time", return_value=1011.0):
+        assert backend.get("a") is None
+
+def test_disk_hit_is_promoted_to_memory(tmp_path):
+    disk = DiskCacheBackend(str(tmp_path))
+    disk.set("key", "cached content")
+    memory = MemoryCacheBackend()
+    cache = LLMCache([memory, disk])
+
+    assert cache.get("key") == "cached content"
+    assert memory.get("key") == "cached content"
+
+def test_from_env_is_opt_in(monkeypatch):
+    monkeypatch.delenv("AUTO_DEV_LLM_CACHE", raising=False)
+    assert LLMCache.from_env() is None
@@ -1,50 +1,56 @@
 import pytest
+from collections import OrderedDict
+import asyncio
+import threading
+import httpx
+from openai import BadRequestError, InternalServerError, RateLimitError
+from types import SimpleNamespace as NS
 from unittest.mock import MagicMock, patch
-from auto_dev_supervisor.infra.llm import GenAIOpenDevinClient
+from auto_dev_supervisor.infra import llm
+from auto_dev_supervisor.infra.llm import GenAIOpenDevinClient, ProviderCircuitBreaker, _CodeBlockStreamParser, _truncate_middle
 from auto_dev_supervisor.domain.model import Task
 
 @pytest.fixture
 def mock_openai():
-    with patch("auto_dev_supervisor.infra.llm.OpenAI") as mock:
+    # Not autospecced: the SDK exposes chat/completions as cached properties.
+    # Pooled clients from earlier tests would bypass the mock.
+    with patch("auto_dev_supervisor.infra.llm.OpenAI") as mock, patch.dict(llm._OPENAI_CLIENTS, clear=True):
         yield mock
 
+def _make_client(project_root):
+    config_manager = MagicMock()
+    config_manager.get_api_key.return_value = "fake-key"
+    return GenAIOpenDevinClient(config_manager=config_manager, project_root=str(project_root))
+
 def test_execute_task_success(mock_openai, tmp_path):
     # Setup
-    client = GenAIOpenDevinClient(api_key="fake-key")
+    client = _make_client(tmp_path)
     task = Task(id="t1", title="Test Task", description="Desc", service_name="svc")
     
-    # Mock response
-    mock_response = MagicMock()
-    mock_response.choices[0].message.content = """
+    # Mock streamed response
+    streamed = """
 Here is the code:
 file.py
 ```python
 print("Hello")
 ```
     """
-    client.client.chat.completions.create.return_value = mock_response
+    mock_chunk = NS(choices=[NS(delta=NS(content=streamed))])
+    client.client.chat.completions.create.return_value = iter([mock_chunk])
     
     # Execute
-    with patch("auto_dev_supervisor.infra.llm.open", new_callable=MagicMock) as mock_open:
-        # We need to mock os.makedirs too
-        with patch("os.makedirs"):
-            # And we need to mock the file handle returned by open
-            mock_file = MagicMock()
-            mock_open.return_value.__enter__.return_value = mock_file
-            
-            result = client.execute_task(task, "context")
-            
-            # Verify
-            assert "Here is the code" in result
-            mock_open.assert_called_with("file.py", "w")
-            mock_file.write.assert_called_with('print("Hello")')
-
-def test_fix_issues_success(mock_openai):
-    client = GenAIOpenDevinClient(api_key="fake-key")
+    result = client.execute_task(task, "context")
+    
+    # Verify
+    assert "Here is the code" in result
+    assert client.client.chat.completions.create.call_args.kwargs["stream"] is True
+    assert (tmp_path / "file.py").read_text() == 'print("Hello")'
+
+def test_fix_issues_success(mock_openai, tmp_path):
+    client = _make_client(tmp_path)
     task = Task(id="t1", title="Test Task", description="Desc", service_name="svc")
     
-    mock_response = MagicMock()
-    mock_response.choices[0].message.content = "Fixed code"
+    mock_response = NS(choices=[NS(message=NS(content="Fixed code"))])
     client.client.chat.completions.create.return_value = mock_response
     
     result = client.fix_issues(task, "error log")
@@ -53,3 +59,188 @@ def test_fix_issues_success(mock_openai):
     # Check that the prompt contains error info
     call_args = client.client.chat.completions.create.call_args
     assert "error log" in call_args.kwargs['messages'][1]['content']
+
+def test_circuit_breaker_opens_after_repeated_failures():
+    breaker = ProviderCircuitBreaker(threshold=2, window=60, cooldown=30)
+    with patch("auto_dev_supervisor.infra.llm.time.time", return_value=1000.0):
+        breaker.record_failure("openai")
+        assert breaker.allow("openai")
+        breaker.record_failure("openai")
+        assert breaker.is_open("openai")
+        assert not breaker.allow("openai")
+        assert breaker.allow("ollama")
+
+def test_circuit_breaker_half_open_probe_closes_on_success():
+    breaker = ProviderCircuitBreaker(threshold=1, window=60, cooldown=30)
+    with patch("auto_dev_supervisor.infra.llm.time.time", return_value=1000.0):
+        breaker.record_failure("openai")
+    with patch("auto_dev_supervisor.infra.llm.time.time", return_value=1031.0):
+        assert breaker.allow("openai")  # single half-open probe
+        assert not breaker.allow("openai")
+        breaker.record_success("openai")
+        assert breaker.allow("openai")
+
+def test_ollama_tags_are_cached_between_inits():
+    http = MagicMock()
+    http.get.return_value.content = b'{"models": [{"name": "llama2"}, {"name": "mistral"}]}'
+    with patch.dict(llm._OLLAMA_TAGS_CACHE, {"ts": 0.0, "names": []}), \
+         patch("auto_dev_supervisor.infra.llm._get_http_client", return_value=http):
+        assert llm._get_ollama_tags() == ["llama2", "mistral"]
+        assert llm._get_ollama_tags() == ["llama2", "mistral"]
+    assert http.get.call_count == 1
+
+def test_stream_parser_writes_blocks_as_they_close():
+    written = []
+    parser = _CodeBlockStreamParser(lambda name, code: written.append((name, code)))
+    parser.feed("Here is app.py\n```python\nprint(1)\n`")
+    assert written == []
+    parser.feed("``\nand now\n```dockerfile\n## filename: Dockerfile.svc\nFROM python")
+    assert written == [("app.py", "print(1)")]
+    parser.feed(":3.11\n```\n")
+    parser.close()
+    assert written[1] == ("Dockerfile.svc", "## filename: Dockerfile.svc\nFROM python:3.11")
+
+def test_quick_lint_skips_review_for_complete_scaffold():
+    client = GenAIOpenDevinClient.__new__(GenAIOpenDevinClient)
+    task = Task(id="t1", title="Scaffold svc", description="Desc", service_name="svc")
+    content = "```dockerfile\n## filename: Dockerfile.svc\nFROM python:3.11\n```\n"
+    assert client._quick_lint(content, task) is False
+    # A scaffold without its Dockerfile, or a block with no filename, still gets reviewed
+    assert client._quick_lint("```python\n# filename: main.py\nprint(1)\n```", task) is True
+    assert client._quick_lint(content + "```\nno name\n```", task) is True
+
+def test_write_file_skips_identical_rewrite(tmp_path):
+    client = GenAIOpenDevinClient.__new__(GenAIOpenDevinClient)
+    client.project_root = str(tmp_path)
+    client._created_dirs = set()
+    client._written = OrderedDict()
+    client._write_file("app/main.py", "print(1)")
+    with patch("auto_dev_supervisor.infra.llm.open") as mock_open:
+        client._write_file("app/main.py", "print(1)")
+        mock_open.assert_not_called()
+    client._write_file("app/main.py", "print(2)")
+    assert (tmp_path / "app" / "main.py").read_text() == "print(2)"
+
+def test_truncate_middle_keeps_head_and_tail():
+    text = "HEAD" + "x" * 1000 + "TAIL"
+    with patch("auto_dev_supervisor.infra.llm._get_encoding", return_value=None):
+        assert _truncate_middle("short", 100) == "short"
+        truncated = _truncate_middle(text, 10)
+    assert truncated.startswith("HEAD") and truncated.endswith("TAIL")
+    assert "[truncated]" in truncated
+    assert len(truncated) < len(text)
+
+def test_execute_task_async_runs_off_the_event_loop_thread():
+    client = GenAIOpenDevinClient.__new__(GenAIOpenDevinClient)
+    task = Task(id="t1", title="Test Task", description="Desc", service_name="svc")
+    loop_thread = threading.get_ident()
+    with patch.object(GenAIOpenDevinClient, "execute_task", side_effect=lambda t, c: threading.get_ident()):
+        worker_thread = asyncio.run(client.execute_task_async(task, "context"))
+    assert worker_thread != loop_thread
+
+def test_alternate_providers_work_inside_a_running_event_loop():
+    client = GenAIOpenDevinClient.__new__(GenAIOpenDevinClient)
+
+    async def race(prompt):
+        return "alt"
+
+    async def caller():
+        return client._try_alternate_providers("prompt")
+
+    with patch.object(client, "_try_alternate_providers_async", side_effect=race):
+        assert client._try_alternate_providers("prompt") == "alt"
+        assert asyncio.run(caller()) == "alt"
+
+@pytest.mark.parametrize("value, workers", [(None, 8), ("3", 3), ("lots", 8), ("0", 1), ("-2", 1)])
+def test_llm_concurrency_env_is_parsed_defensively(monkeypatch, value, workers):
+    if value is None:
+        monkeypatch.delenv(llm.LLM_CONC_ENV_VAR, raising=False)
+    else:
+        monkeypatch.setenv(llm.LLM_CONC_ENV_VAR, value)
+    assert llm._llm_concurrency() == workers
+
+def test_concurrent_identical_requests_share_one_call():
+    client = GenAIOpenDevinClient.__new__(GenAIOpenDevinClient)
+    joined = threading.Event()
+    calls = []
+
+    def slow_call():
+        calls.append(1)
+        joined.wait(5)  # hold the request open until the second caller has joined it
+        return "content"
+
+    results = []
+    with patch.object(llm.log, "info", side_effect=lambda msg: joined.set()):
+        threads = [threading.Thread(target=lambda: results.append(client._coalesce("key", slow_call)))
+                   for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    assert joined.is_set()
+    assert results == ["content", "content"]
+    assert len(calls) == 1
+
+def _api_status_error(error_cls, status):
+    response = httpx.Response(status, request=httpx.Request("POST", "http://llm.test/v1/chat/completions"))
+    return error_cls("error", response=response, body=None)
+
+def test_self_review_rate_limit_trips_circuit_and_bugs_surface():
+    client = GenAIOpenDevinClient.__new__(GenAIOpenDevinClient)
+    client.provider = "rl-test"
+    client._circuit = ProviderCircuitBreaker()
+    task = Task(id="t1", title="Test Task", description="Desc", service_name="svc")
+
+    with patch.object(client, "_request_review", side_effect=_api_status_error(RateLimitError, 429)):
+        assert client._self_review("content", task) is None
+    assert client._circuit.is_open("rl-test")
+
+    with patch.object(client, "_request_review", side_effect=[_api_status_error(InternalServerError, 503), "fixed"]):
+        assert client._self_review("content", task) == "fixed"
+
+    with patch.object(client, "_request_review", side_effect=ValueError("bug")):
+        with pytest.raises(ValueError):
+            client._self_review("content", task)
+
+def test_only_provider_failures_count_against_the_circuit():
+    client = GenAIOpenDevinClient.__new__(GenAIOpenDevinClient)
+    client.provider = "cb-test"
+    client._circuit = ProviderCircuitBreaker(threshold=2)
+
+    def failing(error_cls, status):
+        def call():
+            raise _api_status_error(error_cls, status)
+        return call
+
+    for _ in range(2):
+        with pytest.raises(BadRequestError):
+            client._call_provider(failing(BadRequestError, 400))
+    assert not client._circuit.is_open("cb-test")
+
+    for _ in range(2):
+        with pytest.raises(InternalServerError):
+            client._call_provider(failing(InternalServerError, 503))
+    assert client._circuit.is_open("cb-test")
+
+def test_pooled_clients_keep_the_sdk_read_timeout():
+    from openai import DEFAULT_TIMEOUT
+    with patch.dict(llm._OPENAI_CLIENTS, clear=True):
+        client = llm._get_or_create_client("http://localhost:11434/v1", "ollama")
+    assert client.timeout == DEFAULT_TIMEOUT
+
+def test_construct_prompt_budgets_only_known_models():
+    client = GenAIOpenDevinClient.__new__(GenAIOpenDevinClient)
+    task = Task(id="t1", title="Test Task", description="Desc", service_name="svc")
+    context = "x" * 200000
+    with patch("auto_dev_supervisor.infra.llm._get_encoding", return_value=None):
+        client.model = "my-local-model"
+        assert context in client._construct_prompt(task, context)
+        client.model = "llama2"
+        # ~1.3k tokens fits a 4096-token window alongside the reserved output
+        small = "x" * 5200
+        assert small in client._construct_prompt(task, small)
+        with patch.object(llm.log, "info") as info:
+            prompt = client._construct_prompt(task, context)
+        assert context not in prompt and "[truncated]" in prompt
+        assert len(prompt) > 4 * llm.MIN_CONTEXT_TOKENS
+        info.assert_called_once()
@@ -0,0 +1,57 @@
+import pytest
+import typer
+from unittest.mock import patch
+from auto_dev_supervisor.main import _PERF_DEFAULTS, _load_perf_config
+
+def test_perf_config_defaults_without_file():
+    assert _load_perf_config(None) == _PERF_DEFAULTS
+
+def test_perf_config_merges_json_and_toml(tmp_path):
+    json_path = tmp_path / "perf.json"
+    json_path.write_text('{"max_parallel_requests": 1, "enable_streaming": false}')
+    config = _load_perf_config(str(json_path))
+    assert config["max_parallel_requests"] == 1
+    assert config["enable_streaming"] is False
+    assert config["enable_cache"] is True
+
+    toml_path = tmp_path / "perf.toml"
+    toml_path.write_text("use_enhanced_supervisor = false\n")
+    assert _load_perf_config(str(toml_path))["use_enhanced_supervisor"] is False
+
+@pytest.mark.parametrize("content", ['{"bogus": 1}', '{"max_parallel_requests": true}', "[1, 2]", "{not json",
+                                     '{"max_parallel_requests": 0}', '{"max_parallel_tasks": -1}'])
+def test_perf_config_rejects_bad_files(tmp_path, content):
+    path = tmp_path / "perf.json"
+    path.write_text(content)
+    with pytest.raises(typer.BadParameter):
+        _load_perf_config(str(path))
+
+def test_enhanced_client_is_reused_for_identical_settings(tmp_path):
+    from auto_dev_supervisor import main
+    main._cached_enhanced_client.cache_clear()
+    with patch("auto_dev_supervisor.infra.enhanced_llm.EnhancedGenAIOpenDevinClient", side_effect=lambda **kw: object()) as client_cls:
+        first = main._make_enhanced_client("ollama", None, str(tmp_path), enable_cache=True)
+        second = main._make_enhanced_client("ollama", "llama3.1", str(tmp_path), enable_cache=True)
+        other = main._make_enhanced_client("ollama", None, str(tmp_path), enable_cache=False)
+    main._cached_enhanced_client.cache_clear()
+    assert first is second
+    assert other is not first
+    assert client_cls.call_count == 2
+
+def test_project_root_follows_the_current_directory(tmp_path, monkeypatch):
+    from auto_dev_supervisor.main import _abs
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    monkeypatch.chdir(tmp_path / "a")
+    assert _abs(".") == str((tmp_path / "a").resolve())
+    monkeypatch.chdir(tmp_path / "b")
+    assert _abs(".") == str((tmp_path / "b").resolve())
+
+def test_perf_config_toml_without_tomllib(tmp_path, monkeypatch):
+    import sys
+    path = tmp_path / "perf.toml"
+    path.write_text("enable_cache = false\n")
+    # A None entry makes `import tomllib` raise ImportError, as on Python < 3.11
+    monkeypatch.setitem(sys.modules, "tomllib", None)
+    with pytest.raises(typer.BadParameter, match="Python 3.11"):
+        _load_perf_config(str(path))
@@ -1,11 +1,11 @@
 import pytest
 import os
+import yaml
+from unittest.mock import patch
 from auto_dev_supervisor.core.planner import Planner
 from auto_dev_supervisor.domain.model import ProjectSpec, Task, AppType
 
-@pytest.fixture
-def sample_spec_path(tmp_path):
-    spec_content = """
+SPEC_CONTENT = """
 name: "Test App"
 version: "0.1.0"
 repository_url: "git@github.com:test/app.git"
@@ -15,10 +15,20 @@ services:
     type: "backend"
     description: "A backend service"
     """
+
+@pytest.fixture
+def sample_spec_path(tmp_path):
     p = tmp_path / "test_spec.yaml"
-    p.write_text(spec_content)
+    p.write_text(SPEC_CONTENT)
     return str(p)
 
+@pytest.fixture(scope="module")
+def sample_spec(tmp_path_factory):
+    # Parsed once for the tests that only need the resulting ProjectSpec
+    p = tmp_path_factory.mktemp("spec") / "test_spec.yaml"
+    p.write_text(SPEC_CONTENT)
+    return Planner().parse_spec(str(p))
+
 def test_parse_spec(sample_spec_path):
     planner = Planner()
     spec = planner.parse_spec(sample_spec_path)
@@ -29,10 +39,9 @@ def test_parse_spec(sample_spec_path):
     assert spec.services[0].name == "backend"
     assert spec.services[0].type == AppType.BACKEND
 
-def test_create_initial_tasks(sample_spec_path):
+def test_create_initial_tasks(sample_spec):
     planner = Planner()
-    spec = planner.parse_spec(sample_spec_path)
-    tasks = planner.create_initial_tasks(spec)
+    tasks = planner.create_initial_tasks(sample_spec)
     
     # 1 setup + 3 per service (scaffold, implement, test) = 4
     assert len(tasks) == 4
@@ -47,11 +56,23 @@ def test_create_initial_tasks(sample_spec_path):
     implement_task = next(t for t in tasks if t.id == "implement-backend")
     assert "scaffold-backend" in implement_task.dependencies
 
-def test_get_next_pending_task(sample_spec_path):
+def test_get_next_pending_task(sample_spec):
     planner = Planner()
-    spec = planner.parse_spec(sample_spec_path)
-    tasks = planner.create_initial_tasks(spec)
+    tasks = planner.create_initial_tasks(sample_spec)
     
     # First task should be setup-repo (no deps)
     next_task = planner.get_next_pending_task(tasks)
     assert next_task.id == "setup-repo"
+
+def test_parse_spec_reuses_cached_spec_until_file_changes(sample_spec_path):
+    planner = Planner()
+    with patch("auto_dev_supervisor.core.planner.yaml.load", wraps=yaml.load) as yaml_load:
+        first = planner.parse_spec(sample_spec_path)
+        second = Planner().parse_spec(sample_spec_path)
+        assert yaml_load.call_count == 1
+        assert first == second and first is not second
+
+        with open(sample_spec_path, "a") as f:
+            f.write("\n# edited\n")
+        planner.parse_spec(sample_spec_path)
+        assert yaml_load.call_count == 2
@@ -3,12 +3,9 @@ from unittest.mock import MagicMock, patch
 from auto_dev_supervisor.core.supervisor import Supervisor
 from auto_dev_supervisor.core.planner import Planner
 from auto_dev_supervisor.infra.opendevin import MockOpenDevinClient
-from auto_dev_supervisor.infra.docker import DockerManager
-from auto_dev_supervisor.infra.git import GitManager
 from auto_dev_supervisor.domain.qa import QAManager
-from auto_dev_supervisor.domain.model import TaskTestResult, TaskTestType
 
-def test_full_pipeline_simulation(tmp_path):
+def test_full_pipeline_simulation(tmp_path, docker_mgr_factory, git_mgr_factory):
     # Setup
     spec_path = tmp_path / "spec.yaml"
     spec_path.write_text("""
@@ -25,12 +22,10 @@ services:
     opendevin = MockOpenDevinClient()
     
     # Mock DockerManager to always succeed
-    docker_manager = MagicMock(spec=DockerManager)
-    docker_manager.build_services.return_value = True
-    docker_manager.run_tests.return_value = TaskTestResult(type=TaskTestType.UNIT, passed=True, details="Pass")
+    docker_manager = docker_mgr_factory()
     
     # Mock GitManager
-    git_manager = MagicMock(spec=GitManager)
+    git_manager = git_mgr_factory()
     git_manager.commit_changes.return_value = True
     git_manager.push_changes.return_value = True
     
@@ -41,7 +36,8 @@ services:
         opendevin=opendevin,
         docker_manager=docker_manager,
         git_manager=git_manager,
-        qa_manager=qa_manager
+        qa_manager=qa_manager,
+        project_root=str(tmp_path)
     )
     
     # Run